@@ -9,7 +9,7 @@ from typing import Dict, List, Optional
 from ..libs.schemas.models import Offer, PaymentInput, TrustAssessment
 
 from .state import SagaState
-from ..apps.agent1_vision.main import intake_image
+from ..apps.agent1_vision.main import intake_image, intake_image_bytes
 from ..apps.agent2_intent.main import confirm_intent
 from ..apps.agent3_sourcing.main import (
     offers_for_intent,
@@ -43,16 +43,19 @@ def _event(stage: str, dt: float, **extra: object) -> Dict[str, object]:
 
 
 async def capture_node(state: SagaState, *_args, **_kwargs) -> Dict[str, object]:
-    if not state.image_path:
-        raise ValueError("capture_node requires 'image_path' on the state.")
+    if state.image_bytes is None and not state.image_path:
+        raise ValueError("capture_node requires 'image_bytes' or 'image_path' on the state.")
 
-    t0 = time.time()
-    hypothesis = await intake_image(state.image_path)
+    t0 = time.monotonic()
+    if state.image_bytes is not None:
+        hypothesis = await intake_image_bytes(state.image_bytes, state.image_path or "upload.jpg")
+    else:
+        hypothesis = await intake_image(state.image_path)
     events = list(state.events)
     events.append(
         _event(
             "S1_CAPTURE",
-            time.time() - t0,
+            time.monotonic() - t0,
             label=hypothesis.label,
             brand=hypothesis.brand,
             color=hypothesis.color,
@@ -77,13 +80,13 @@ async def intent_node(state: SagaState, *_args, **_kwargs) -> Dict[str, object]:
     if not state.hypothesis:
         raise ValueError("intent_node requires 'hypothesis' to be set.")
 
-    t0 = time.time()
+    t0 = time.monotonic()
     intent = await confirm_intent(state.hypothesis, user_text=state.user_text)
     events = list(state.events)
     events.append(
         _event(
             "S2_CONFIRM",
-            time.time() - t0,
+            time.monotonic() - t0,
             item=intent.item_name,
             color=intent.color,
             quantity=intent.quantity,
@@ -115,16 +118,17 @@ async def intent_node(state: SagaState, *_args, **_kwargs) -> Dict[str, object]:
     return {"intent": intent, "events": events, "messages": messages}
 
 
+def _url_key(url: Optional[str]) -> str:
+    return (url or "").rstrip("/").lower()
+
+
 def _pick_best_offer(
-    offers: List[Offer], preferred_url: Optional[str]
+    offers: List[Offer], by_url: Dict[str, Offer], preferred_url: Optional[str]
 ) -> Optional[Offer]:
     if not offers:
         return None
     if preferred_url:
-        target = preferred_url.rstrip("/").lower()
-        for offer in offers:
-            if offer.url.rstrip("/").lower() == target:
-                return offer
+        return by_url.get(_url_key(preferred_url), offers[0])
     return offers[0]
 
 
@@ -132,7 +136,7 @@ async def sourcing_node(state: SagaState, *_args, **_kwargs) -> Dict[str, object
     if not state.intent:
         raise ValueError("sourcing_node requires 'intent' to be set.")
 
-    t0 = time.time()
+    t0 = time.monotonic()
     # Run strict and fuzzy strategies in parallel, then merge
     top_k = 5
     token_budgets = state.token_budgets
@@ -153,7 +157,7 @@ async def sourcing_node(state: SagaState, *_args, **_kwargs) -> Dict[str, object
     merged: Dict[str, Offer] = {}
     def _add_all(lst: List[Offer]):
         for o in lst or []:
-            key = (o.url or "").rstrip("/").lower()
+            key = _url_key(o.url)
             if key in merged:
                 if (o.score or 0) > (merged[key].score or 0):
                     merged[key] = o
@@ -163,10 +167,11 @@ async def sourcing_node(state: SagaState, *_args, **_kwargs) -> Dict[str, object
     _add_all(fuzzy_offers)
     offers = sorted(merged.values(), key=lambda x: x.score or 0.0, reverse=True)
 
-    best_offer = _pick_best_offer(offers, state.preferred_offer_url)
+    # merged is already keyed by normalized URL, so the preferred offer is a dict lookup.
+    best_offer = _pick_best_offer(offers, merged, state.preferred_offer_url)
 
     events = list(state.events)
-    dt_total = time.time() - t0
+    dt_total = time.monotonic() - t0
     events.append(_event("S3_BRANCH", dt_total, strict_count=len(strict_offers or []), fuzzy_count=len(fuzzy_offers or [])))
     events.append(_event("S3_SOURCING", 0.0, offer_count=len(offers), best_vendor=getattr(best_offer, "vendor", None), best_price=getattr(best_offer, "price_usd", None)))
     messages = list(state.messages)
@@ -211,12 +216,12 @@ async def trust_node(state: SagaState, *_args, **_kwargs) -> Dict[str, object]:
     events = list(state.events)
     messages = list(state.messages)
 
-    t0 = time.time()
+    t0 = time.monotonic()
     trust = await assess_trust(best_offer)
     events.append(
         _event(
             "S4_TRUST",
-            time.time() - t0,
+            time.monotonic() - t0,
             vendor=best_offer.vendor,
             risk=trust.risk,
         )
@@ -311,7 +316,7 @@ async def trust_node(state: SagaState, *_args, **_kwargs) -> Dict[str, object]:
         if state.latency_caps_ms and state.latency_caps_ms.get("S4_COMP_EXTRA_LATENCY_MS") is not None:
             extra_cap_ms = int(state.latency_caps_ms["S4_COMP_EXTRA_LATENCY_MS"])
 
-        start_ms = time.time() * 1000.0
+        start_ms = time.monotonic() * 1000.0
         baseline = best_offer.price_usd or 0.0
         attempts = 0
         for candidate in offers:
@@ -319,14 +324,14 @@ async def trust_node(state: SagaState, *_args, **_kwargs) -> Dict[str, object]:
                 break
             if candidate == best_offer:
                 continue
-            if (time.time() * 1000.0) - start_ms > extra_cap_ms:
+            if (time.monotonic() * 1000.0) - start_ms > extra_cap_ms:
                 break
             # Price window check
             price_ok = True
             if baseline and candidate.price_usd is not None and price_window_pct >= 0:
                 price_delta_pct = 100.0 * ((candidate.price_usd - baseline) / baseline)
                 price_ok = price_delta_pct <= price_window_pct
-            t1 = time.time()
+            t1 = time.monotonic()
             candidate_trust: TrustAssessment = await assess_trust(candidate)
             safer = candidate_trust.risk < trust.risk
             switched = bool(safer and price_ok)
@@ -334,7 +339,7 @@ async def trust_node(state: SagaState, *_args, **_kwargs) -> Dict[str, object]:
             events.append(
                 _event(
                     "S4_COMPENSATE",
-                    time.time() - t1,
+                    time.monotonic() - t1,
                     candidate_vendor=candidate.vendor,
                     candidate_risk=candidate_trust.risk,
                     price_delta_pct=(None if baseline == 0 else round(100.0 * ((candidate.price_usd - baseline) / baseline), 2)),
@@ -388,7 +393,7 @@ async def checkout_node(state: SagaState, *_args, **_kwargs) -> Dict[str, object
     payment_copy = payment.model_copy()
     payment_copy.amount_usd = best_offer.price_usd
 
-    t0 = time.time()
+    t0 = time.monotonic()
     receipt = await checkout_pay(
         best_offer,
         payment_copy,
@@ -397,7 +402,7 @@ async def checkout_node(state: SagaState, *_args, **_kwargs) -> Dict[str, object
     events.append(
         _event(
             "S5_CHECKOUT",
-            time.time() - t0,
+            time.monotonic() - t0,
             vendor=best_offer.vendor,
             amount=best_offer.price_usd,
             order_id=receipt.order_id,
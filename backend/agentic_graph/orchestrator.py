@@ -27,9 +27,17 @@ def _coerce_payment(
     raise TypeError("payment must be a PaymentInput or dict")
 
 
+def _state_from_result(result: Any) -> SagaState:
+    # Graph outputs are model instances our own nodes produced; skip re-validating them.
+    if isinstance(result, SagaState):
+        return result
+    return SagaState.model_construct(**result)
+
+
 async def run_saga_async(
     *,
-    image_path: str,
+    image_path: Optional[str] = None,
+    image_bytes: Optional[bytes] = None,
     user_text: Optional[str] = None,
     payment: Optional[Union[PaymentInput, Dict[str, Any]]] = None,
     preferred_offer_url: Optional[str] = None,
@@ -40,9 +48,13 @@ async def run_saga_async(
     comp_top_k: Optional[int] = None,
     comp_price_window_pct: Optional[float] = None,
 ) -> SagaState:
-    """Execute the full saga including checkout."""
+    """Execute the full saga including checkout.
+
+    Pass ``image_bytes`` to skip the disk round-trip; ``image_path`` then only names the upload.
+    """
     initial_state = SagaState(
         image_path=image_path,
+        image_bytes=image_bytes,
         user_text=user_text,
         payment=_coerce_payment(payment),
         preferred_offer_url=preferred_offer_url,
@@ -55,12 +67,13 @@ async def run_saga_async(
     )
     graph = _get_graph(include_checkout=True)
     result = await graph.ainvoke(initial_state)
-    return SagaState.model_validate(result)
+    return _state_from_result(result)
 
 
 async def run_saga_preview_async(
     *,
-    image_path: str,
+    image_path: Optional[str] = None,
+    image_bytes: Optional[bytes] = None,
     user_text: Optional[str] = None,
     preferred_offer_url: Optional[str] = None,
     token_budgets: Optional[Dict[str, Dict[str, int]]] = None,
@@ -72,6 +85,7 @@ async def run_saga_preview_async(
     """Run S1-S4 only (capture, intent, sourcing, trust)."""
     initial_state = SagaState(
         image_path=image_path,
+        image_bytes=image_bytes,
         user_text=user_text,
         preferred_offer_url=preferred_offer_url,
         token_budgets=token_budgets,
@@ -82,7 +96,7 @@ async def run_saga_preview_async(
     )
     graph = _get_graph(include_checkout=False)
     result = await graph.ainvoke(initial_state)
-    return SagaState.model_validate(result)
+    return _state_from_result(result)
 
 
 def run_saga_sync(**kwargs) -> SagaState:
@@ -19,6 +19,7 @@ class SagaState(BaseModel):
 
     # Inputs
     image_path: Optional[str] = None
+    image_bytes: Optional[bytes] = None  # in-memory upload; image_path then only names it
     user_text: Optional[str] = None
     preferred_offer_url: Optional[str] = None
     payment: Optional[PaymentInput] = None
@@ -1,16 +1,19 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
-import json
+import asyncio
+import io
 import logging
 import os
+import re
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, Dict, Any
 
 import numpy as np
 from google.cloud import vision
-from google.protobuf.json_format import MessageToDict
+from google.protobuf.json_format import MessageToJson
 from PIL import Image
 
 from ...libs.schemas.models import BBox, ProductHypothesis
@@ -39,44 +42,53 @@ OBJECT_CONFIG: dict[str, ObjectConfig] = {
     "sneaker": ObjectConfig(display_name="sneaker", category="footwear"),
 }
 
-ALLOW_LABELS = set(OBJECT_CONFIG.keys())
-
-BRANDS = {
-    "nike": "Nike",
-    "adidas": "Adidas",
-    "puma": "Puma",
-    "reebok": "Reebok",
-    "under armour": "Under Armour",
-    "new balance": "New Balance",
-    "camelbak": "CamelBak",
-    "contigo": "Contigo",
-    "pilot": "Pilot",
-    "bic": "BIC",
-    "sharpie": "Sharpie",
-    "stabilo": "Stabilo",
-    "logitech": "Logitech",
-    "razer": "Razer",
-    "hp": "HP",
-    "hewlett": "HP",
-    "lenovo": "Lenovo",
-    "dell": "Dell",
-    "asus": "ASUS",
-    "acer": "Acer",
-    "apple": "Apple",
-    "samsung": "Samsung",
-    "sony": "Sony",
-    "anker": "Anker",
-}
+ALLOW_LABELS = frozenset(OBJECT_CONFIG)
+
 
-BRAND_DEFAULT_LABEL = {
-    "nike": "sneaker",
-    "adidas": "sneaker",
-    "puma": "sneaker",
-    "reebok": "sneaker",
-    "under armour": "sneaker",
-    "new balance": "sneaker",
+@dataclass(frozen=True)
+class BrandInfo:
+    display: str
+    default_label: Optional[str] = None
+
+
+BRAND_DB: dict[str, BrandInfo] = {
+    "nike": BrandInfo(display="Nike", default_label="sneaker"),
+    "adidas": BrandInfo(display="Adidas", default_label="sneaker"),
+    "puma": BrandInfo(display="Puma", default_label="sneaker"),
+    "reebok": BrandInfo(display="Reebok", default_label="sneaker"),
+    "under armour": BrandInfo(display="Under Armour", default_label="sneaker"),
+    "new balance": BrandInfo(display="New Balance", default_label="sneaker"),
+    "camelbak": BrandInfo(display="CamelBak"),
+    "contigo": BrandInfo(display="Contigo"),
+    "pilot": BrandInfo(display="Pilot"),
+    "bic": BrandInfo(display="BIC"),
+    "sharpie": BrandInfo(display="Sharpie"),
+    "stabilo": BrandInfo(display="Stabilo"),
+    "logitech": BrandInfo(display="Logitech"),
+    "razer": BrandInfo(display="Razer"),
+    "hp": BrandInfo(display="HP"),
+    "hewlett": BrandInfo(display="HP"),
+    "lenovo": BrandInfo(display="Lenovo"),
+    "dell": BrandInfo(display="Dell"),
+    "asus": BrandInfo(display="ASUS"),
+    "acer": BrandInfo(display="Acer"),
+    "apple": BrandInfo(display="Apple"),
+    "samsung": BrandInfo(display="Samsung"),
+    "sony": BrandInfo(display="Sony"),
+    "anker": BrandInfo(display="Anker"),
 }
 
+
+def _alternation(keys) -> str:
+    # Longest keys first so the regex engine prefers "new balance" over shorter prefixes.
+    return "|".join(re.escape(key) for key in sorted(keys, key=len, reverse=True))
+
+
+_BRAND_PATTERN = re.compile(_alternation(BRAND_DB))
+# Brand and label keys share one pattern so a filename is scanned once. The
+# lookahead alternation also reports overlapping hits.
+_FILENAME_PATTERN = re.compile(f"(?=({_alternation([*OBJECT_CONFIG, *BRAND_DB])}))")
+
 _LOG_RESPONSES = os.getenv("VISION_LOG_RESPONSES", "0").lower() in {"1", "true", "yes"}
 _LOG_DIR = Path(os.getenv("VISION_LOG_DIR", "logs/vision"))
 
@@ -116,11 +128,11 @@ def _log_response(response: vision.AnnotateImageResponse, source: str) -> None:
     if not _LOG_RESPONSES:
         return
     try:
-        payload = MessageToDict(response._pb, preserving_proto_field_name=True)  # type: ignore[attr-defined]
+        payload = MessageToJson(response._pb, preserving_proto_field_name=True, indent=2)  # type: ignore[attr-defined]
         _LOG_DIR.mkdir(parents=True, exist_ok=True)
         name = f"vision_{Path(source).stem}_{os.getpid()}"
         outfile = _LOG_DIR / f"{name}.json"
-        outfile.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        outfile.write_text(payload, encoding="utf-8")
     except Exception as err:  # pragma: no cover
         logger.debug("Failed to log vision response: %s", err)
 
@@ -134,17 +146,14 @@ def _dominant_color(resp: vision.AnnotateImageResponse) -> Optional[str]:
     return rgb_to_name(rgb)
 
 
-def _extract_brand(resp: vision.AnnotateImageResponse) -> Optional[str]:
+def _extract_brand(resp: vision.AnnotateImageResponse) -> Optional[BrandInfo]:
     if not resp.text_annotations:
         return None
     full_text = " ".join([a.description for a in resp.text_annotations])
     if not full_text:
         return None
-    lower = full_text.lower()
-    for raw, nice in BRANDS.items():
-        if raw in lower:
-            return nice
-    return None
+    match = _BRAND_PATTERN.search(full_text.lower())
+    return BRAND_DB[match.group(0)] if match else None
 
 
 def _bbox_from_object(obj: vision.LocalizedObjectAnnotation, size: tuple[int, int]) -> Optional[BBox]:
@@ -188,20 +197,22 @@ def _build_hypothesis(
 def _fallback_from_filename(filename: str) -> ProductHypothesis:
     base = os.path.basename(filename).lower()
     label = "object"
-    brand = None
-    for raw, nice in BRANDS.items():
-        if raw in base:
-            brand = nice
-            break
-    for key in ALLOW_LABELS:
-        if key in base:
+    brand_info: Optional[BrandInfo] = None
+    for match in _FILENAME_PATTERN.finditer(base):
+        key = match.group(1)
+        if key in BRAND_DB:
+            brand_info = brand_info or BRAND_DB[key]
+        elif label == "object":
             label = key
+        if brand_info and label != "object":
             break
-    if label == "object" and brand:
-        label = BRAND_DEFAULT_LABEL.get(brand.lower(), label)
+    if label == "object" and brand_info and brand_info.default_label:
+        label = brand_info.default_label
+    brand = brand_info.display if brand_info else None
     return _build_hypothesis(label=label, confidence=0.5, brand=brand, bbox=None, color=None)
 
 
+@lru_cache(maxsize=1)
 def _langchain_enabled() -> bool:
     flag = os.getenv("USE_LANGCHAIN_VISION", os.getenv("USE_LANGCHAIN", "0"))
     return flag is not None and flag.strip().lower() in {"1", "true", "yes"}
@@ -218,14 +229,17 @@ async def _finalize_with_llm(hypothesis: ProductHypothesis, evidence: Dict[str,
 
 
 async def intake_image(filename: str) -> ProductHypothesis:
-    evidence: dict[str, Any] = {"source": Path(filename).name}
     try:
         with open(filename, "rb") as f:
             content = f.read()
     except FileNotFoundError:
-        evidence["fallback_reason"] = "file_not_found"
+        evidence: dict[str, Any] = {"source": Path(filename).name, "fallback_reason": "file_not_found"}
         return await _finalize_with_llm(_fallback_from_filename(filename), evidence)
+    return await intake_image_bytes(content, filename)
 
+
+async def intake_image_bytes(content: bytes, name_hint: str) -> ProductHypothesis:
+    evidence: dict[str, Any] = {"source": Path(name_hint).name}
     client = _client()
     image = vision.Image(content=content)
     features = [
@@ -239,23 +253,29 @@ async def intake_image(filename: str) -> ProductHypothesis:
         response = client.annotate_image({"image": image, "features": features})
     except Exception:
         evidence["fallback_reason"] = "vision_api_error"
-        return await _finalize_with_llm(_fallback_from_filename(filename), evidence)
+        return await _finalize_with_llm(_fallback_from_filename(name_hint), evidence)
 
-    _log_response(response, filename)
+    if _LOG_RESPONSES:
+        await asyncio.to_thread(_log_response, response, name_hint)
 
     try:
-        with Image.open(filename) as pil_img:
+        with Image.open(io.BytesIO(content)) as pil_img:
             width, height = pil_img.size
     except Exception:
         width = height = 0
 
     objects = sorted(
-        [obj for obj in response.localized_object_annotations if obj.name.lower() in ALLOW_LABELS],
-        key=lambda o: o.score,
+        [
+            (name, obj)
+            for obj in response.localized_object_annotations
+            if (name := obj.name.lower()) in ALLOW_LABELS
+        ],
+        key=lambda item: item[1].score,
         reverse=True,
     )
 
-    brand = _extract_brand(response)
+    brand_info = _extract_brand(response)
+    brand = brand_info.display if brand_info else None
     color = _dominant_color(response)
     evidence.update(
         {
@@ -265,8 +285,7 @@ async def intake_image(filename: str) -> ProductHypothesis:
     )
 
     if objects and width and height:
-        top = objects[0]
-        label = top.name.lower()
+        label, top = objects[0]
         bbox = _bbox_from_object(top, (width, height))
         hypo = _build_hypothesis(
             label=label,
@@ -282,11 +301,12 @@ async def intake_image(filename: str) -> ProductHypothesis:
         return await _finalize_with_llm(hypo, evidence)
 
     labels = [
-        lab for lab in response.label_annotations if (lab.description or "").lower() in ALLOW_LABELS
+        (name, lab)
+        for lab in response.label_annotations
+        if (name := (lab.description or "").lower()) in ALLOW_LABELS
     ]
     if labels:
-        lab = max(labels, key=lambda l: l.score or 0.0)
-        label = (lab.description or "object").lower()
+        label, lab = max(labels, key=lambda item: item[1].score or 0.0)
         hypo = _build_hypothesis(
             label=label,
             confidence=lab.score or 0.0,
@@ -317,15 +337,10 @@ async def intake_image(filename: str) -> ProductHypothesis:
         )
         return await _finalize_with_llm(hypo, evidence)
 
-    hypo = _build_hypothesis(label="object", confidence=0.0, brand=brand, bbox=None, color=color)
-    if hypo.label == "object" and hypo.brand:
-        hypo.label = BRAND_DEFAULT_LABEL.get(hypo.brand.lower(), hypo.label)
-        cfg = OBJECT_CONFIG.get(hypo.label, ObjectConfig(display_name=hypo.label, category=None))
-        hypo.display_name = cfg.display_name
-        hypo.category = cfg.category
-        hypo.item_type = cfg.category
+    label = (brand_info.default_label if brand_info else None) or "object"
+    hypo = _build_hypothesis(label=label, confidence=0.0, brand=brand, bbox=None, color=color)
     logger.info("vision_default_object", extra={"label": hypo.label, "brand": hypo.brand})
     return await _finalize_with_llm(hypo, evidence)
 
 
-__all__ = ["intake_image", "_set_client_for_tests"]
+__all__ = ["intake_image", "intake_image_bytes", "_set_client_for_tests"]
@@ -1,12 +1,9 @@
 from __future__ import annotations
 
-import os
-import tempfile
-
 from fastapi import FastAPI, File, HTTPException, UploadFile
 
 from ...libs.schemas.models import ProductHypothesis
-from .main import intake_image
+from .main import intake_image_bytes
 
 app = FastAPI(title="Agent 1 - Vision", version="0.1.0")
 
@@ -18,23 +15,13 @@ async def health() -> dict[str, str]:
 
 @app.post("/intake", response_model=ProductHypothesis)
 async def intake(image: UploadFile = File(...)) -> ProductHypothesis:
-    suffix = os.path.splitext(image.filename or "")[1] or ".jpg"
-    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-        contents = await image.read()
-        tmp.write(contents)
-        tmp_path = tmp.name
-
+    contents = await image.read()
     try:
-        return await intake_image(tmp_path)
+        return await intake_image_bytes(contents, image.filename or "upload.jpg")
     except HTTPException:
         raise
     except Exception as exc:
         raise HTTPException(status_code=500, detail=f"vision_failed: {exc}") from exc
-    finally:
-        try:
-            os.remove(tmp_path)
-        except OSError:
-            pass
 
 
 @app.get("/metrics")
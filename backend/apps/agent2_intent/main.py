@@ -3,6 +3,7 @@
 import logging
 import os
 import re
+from functools import lru_cache
 from typing import Optional
 
 from ...libs.agents.intent_chain import run_intent_chain
@@ -172,7 +173,11 @@ async def confirm_intent(hypo: ProductHypothesis, user_text: Optional[str] = Non
             return await run_intent_chain(hypo, user_text)
         except Exception as exc:
             logger.warning("LangChain intent fallback triggered: %s", exc, exc_info=True)
+    return rule_based_intent(hypo, user_text)
 
+
+def rule_based_intent(hypo: ProductHypothesis, user_text: Optional[str] = None) -> PurchaseIntent:
+    """Deterministic intent from the hypothesis plus keyword parsing of the user's text."""
     t = (user_text or "").lower().strip()
     qty = _extract_qty(t)
     budget = _extract_budget(t)
@@ -245,6 +250,7 @@ async def confirm_intent(hypo: ProductHypothesis, user_text: Optional[str] = Non
     )
 
 
+@lru_cache(maxsize=1)
 def _langchain_enabled() -> bool:
     flag = os.getenv("USE_LANGCHAIN_INTENT", os.getenv("USE_LANGCHAIN", "0"))
     return flag is not None and flag.strip().lower() in {"1", "true", "yes"}
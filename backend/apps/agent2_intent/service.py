@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import logging
 import os
+from functools import lru_cache
 
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
@@ -59,6 +60,7 @@ async def confirm(payload: ConfirmRequest) -> PurchaseIntent:
     return await confirm_intent(hypo, user_text=payload.user_text)
 
 
+@lru_cache(maxsize=1)
 def _langchain_enabled() -> bool:
     flag = os.getenv("USE_LANGCHAIN_INTENT", os.getenv("USE_LANGCHAIN", "0"))
     return flag is not None and flag.strip().lower() in {"1", "true", "yes"}
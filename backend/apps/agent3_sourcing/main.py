@@ -244,6 +244,7 @@ async def offers_for_intent_fuzzy(
     return await _score_candidates(pi, merged, catalog, top_k, token_budgets=token_budgets, token_policy=token_policy)
 
 
+@lru_cache(maxsize=1)
 def _langchain_enabled() -> bool:
     flag = os.getenv("USE_LANGCHAIN_SOURCING", os.getenv("USE_LANGCHAIN", "0"))
     return flag is not None and flag.strip().lower() in {"1", "true", "yes"}
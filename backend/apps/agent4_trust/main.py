@@ -4,15 +4,13 @@ from __future__ import annotations
 import logging
 import os
 from dataclasses import asdict, dataclass
-from typing import Dict, Optional
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional
 
 from ...libs.agents.trust_chain import llm_adjust_trust
 from ...libs.schemas.models import Offer, TrustAssessment
-from ...libs.providers.price_refs import (
-    compute_dimension_zscores,
-    compute_price_z,
-    compute_weight_z,
-)
+from ...libs.providers.price_refs import compute_all_zscores
 
 
 @dataclass(frozen=True)
@@ -26,13 +24,23 @@ class VendorProfile:
     average_refund_time_days: int = 7
 
 
-VENDOR_PROFILES: Dict[str, VendorProfile] = {
+VENDOR_PROFILES: Mapping[str, VendorProfile] = MappingProxyType({
     "Mockazon": VendorProfile(tls=True, domain_age_days=2400, has_policy_pages=True, happy_reviews_pct=0.92, accepts_returns=True, average_refund_time_days=5),
     "Shoply": VendorProfile(tls=True, domain_age_days=1100, has_policy_pages=True, happy_reviews_pct=0.88, accepts_returns=True, average_refund_time_days=7),
     "SuperMart": VendorProfile(tls=True, domain_age_days=3200, has_policy_pages=True, happy_reviews_pct=0.85, accepts_returns=True, average_refund_time_days=6),
     "MegaBuy": VendorProfile(tls=True, domain_age_days=650, has_policy_pages=True, happy_reviews_pct=0.81, accepts_returns=True, average_refund_time_days=8),
     "GigaDeal": VendorProfile(tls=True, domain_age_days=120, has_policy_pages=False, historical_issues=True, happy_reviews_pct=0.64, accepts_returns=False, average_refund_time_days=14),
-}
+})
+
+_UNKNOWN_VENDOR = VendorProfile(
+    tls=False,
+    domain_age_days=45,
+    has_policy_pages=False,
+    historical_issues=True,
+    happy_reviews_pct=0.5,
+    accepts_returns=False,
+    average_refund_time_days=21,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -83,29 +91,22 @@ def _compute_risk(profile: VendorProfile, offer: Offer) -> str:
     return "high"
 
 
+@lru_cache(maxsize=None)
+def _profile_dict(profile: VendorProfile) -> Dict[str, Any]:
+    # Profiles are frozen and few; the cached dict is shared, so callers must not mutate it.
+    return asdict(profile)
+
+
+_RISK_ORDER = {"low": 0, "medium": 1, "high": 2}
+_RISK_BY_ORDER = ("low", "medium", "high")
+
+
 def _raise_risk(current: str, target: str) -> str:
-    order = ["low", "medium", "high"]
-    try:
-        idx = order.index(current)
-        tgt = order.index(target)
-        return order[max(idx, tgt)]
-    except ValueError:
-        return target
+    return _RISK_BY_ORDER[max(_RISK_ORDER.get(current, 0), _RISK_ORDER.get(target, 0))]
 
 
 async def assess(offer: Offer) -> TrustAssessment:
-    profile = VENDOR_PROFILES.get(
-        offer.vendor,
-        VendorProfile(
-            tls=False,
-            domain_age_days=45,
-            has_policy_pages=False,
-            historical_issues=True,
-            happy_reviews_pct=0.5,
-            accepts_returns=False,
-            average_refund_time_days=21,
-        ),
-    )
+    profile = VENDOR_PROFILES.get(offer.vendor, _UNKNOWN_VENDOR)
     risk = _compute_risk(profile, offer)
     assessment = TrustAssessment(
         vendor=offer.vendor,
@@ -118,41 +119,37 @@ async def assess(offer: Offer) -> TrustAssessment:
         average_refund_time_days=profile.average_refund_time_days,
         historical_issues=profile.historical_issues,
     )
-    # Price anomaly (z-score) if references are available
+    # Price/weight/dimension anomalies (z-scores) if references are available
     try:
-        z = compute_price_z(offer)
+        zscores = compute_all_zscores(offer)
     except Exception:
-        z = None
+        zscores = {}
+    z = zscores.get("price")
     if z is not None:
         assessment.price_zscore = float(z)
         if z <= -2.0:
             assessment.risk = _raise_risk(assessment.risk, "high")
 
-    try:
-        weight_z = compute_weight_z(offer)
-    except Exception:
-        weight_z = None
+    weight_z = zscores.get("weight")
     if weight_z is not None:
         assessment.weight_zscore = float(weight_z)
         if abs(weight_z) >= 3:
             assessment.risk = _raise_risk(assessment.risk, "high")
 
-    try:
-        dim_z = compute_dimension_zscores(offer)
-    except Exception:
-        dim_z = {}
+    dim_z = zscores.get("dimensions")
     if dim_z:
         assessment.dimension_zscores = {k: float(v) for k, v in dim_z.items()}
         if any(abs(v) >= 3 for v in dim_z.values()):
             assessment.risk = _raise_risk(assessment.risk, "medium")
     if _langchain_enabled():
         try:
-            assessment = await llm_adjust_trust(offer, assessment, asdict(profile))
+            assessment = await llm_adjust_trust(offer, assessment, _profile_dict(profile))
         except Exception as exc:
             logger.warning("LangChain trust adjustment failed: %s", exc, exc_info=True)
     return assessment
 
 
+@lru_cache(maxsize=1)
 def _langchain_enabled() -> bool:
     flag = os.getenv("USE_LANGCHAIN_TRUST", os.getenv("USE_LANGCHAIN", "0"))
     return flag is not None and flag.strip().lower() in {"1", "true", "yes"}
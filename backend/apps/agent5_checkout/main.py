@@ -1,6 +1,8 @@
 ﻿import json
 import os
-from typing import Dict
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
 
 from ...libs.schemas.models import PaymentInput, Receipt, Offer
 from ...libs.utils.payment import (
@@ -14,10 +16,32 @@ from ...libs.utils.payment import (
 _MAX_AMOUNT = float(os.getenv("CHECKOUT_MAX_AMOUNT", "5000"))
 _BLACKLISTED_VENDORS = {"FraudCo", "ScamSupply", "UnknownMart"}
 
-_RECEIPT_STORE: Dict[str, Receipt] = {}
+_RECEIPT_STORE_MAX = int(os.getenv("CHECKOUT_RECEIPT_STORE_MAX", "10000"))
+_RECEIPT_TTL_S = float(os.getenv("CHECKOUT_RECEIPT_TTL_S", "3600"))
+# idempotency key -> (stored_at, receipt); LRU-ordered, oldest first.
+_RECEIPT_STORE: "OrderedDict[str, Tuple[float, Receipt]]" = OrderedDict()
 _CARD_ACTIVITY: Dict[str, int] = {}
 
 
+def _cached_receipt(key: str) -> Optional[Receipt]:
+    entry = _RECEIPT_STORE.get(key)
+    if entry is None:
+        return None
+    stored_at, receipt = entry
+    if time.monotonic() - stored_at > _RECEIPT_TTL_S:
+        del _RECEIPT_STORE[key]
+        return None
+    _RECEIPT_STORE.move_to_end(key)
+    return receipt
+
+
+def _store_receipt(key: str, receipt: Receipt) -> None:
+    _RECEIPT_STORE[key] = (time.monotonic(), receipt)
+    _RECEIPT_STORE.move_to_end(key)
+    while len(_RECEIPT_STORE) > _RECEIPT_STORE_MAX:
+        _RECEIPT_STORE.popitem(last=False)
+
+
 def _digits(card_number: str) -> str:
     return "".join(ch for ch in card_number if ch.isdigit())
 
@@ -105,8 +129,9 @@ async def pay(offer: Offer, payment: PaymentInput, idem_key: str) -> Receipt:
     )
     calc_key = idempotency_key(payload)
     idem_key = idem_key or calc_key
-    if idem_key in _RECEIPT_STORE:
-        return _RECEIPT_STORE[idem_key]
+    cached = _cached_receipt(idem_key)
+    if cached is not None:
+        return cached
 
     receipt = Receipt(
         order_id=calc_key[:12],
@@ -116,5 +141,5 @@ async def pay(offer: Offer, payment: PaymentInput, idem_key: str) -> Receipt:
         card_brand=card_brand,
         masked_card=masked,
     )
-    _RECEIPT_STORE[idem_key] = receipt
+    _store_receipt(idem_key, receipt)
     return receipt
@@ -4,6 +4,8 @@ import os
 from typing import Mapping
 
 import httpx
+import orjson
+from pydantic import TypeAdapter
 
 from ...libs.schemas.models import (
     Offer,
@@ -29,6 +31,11 @@ _AGENT_SOURCING_URL = os.getenv("AGENT_SOURCING_URL")
 _AGENT_TRUST_URL = os.getenv("AGENT_TRUST_URL")
 _AGENT_CHECKOUT_URL = os.getenv("AGENT_CHECKOUT_URL")
 
+# Validate agent responses straight from bytes so parsing stays in pydantic-core.
+_OFFER_LIST = TypeAdapter(list[Offer])
+# Request bodies are encoded with orjson rather than httpx's stdlib json encoder.
+_JSON_HEADERS = {"Accept": "application/json", "Content-Type": "application/json"}
+
 
 def _merge_headers(base: Mapping[str, str] | None, extra: Mapping[str, str] | None) -> dict[str, str]:
     merged: dict[str, str] = {}
@@ -54,7 +61,7 @@ async def call_vision(
             files = {"image": (os.path.basename(image_filename), data, "application/octet-stream")}
             resp = await client.post(url, files=files, headers=req_headers)
     resp.raise_for_status()
-    return ProductHypothesis.model_validate(resp.json())
+    return ProductHypothesis.model_validate_json(resp.content)
 
 
 async def call_intent_confirm(
@@ -79,7 +86,7 @@ async def call_intent_confirm(
         return await local_confirm_intent(hypothesis, user_text=user_text)
 
     url = f"{_AGENT_INTENT_URL.rstrip('/')}/confirm"
-    req_headers = _merge_headers({"Accept": "application/json"}, headers)
+    req_headers = _merge_headers(_JSON_HEADERS, headers)
     payload = {
         "hypothesis": hypothesis.model_dump(),
         "user_text": user_text,
@@ -89,9 +96,9 @@ async def call_intent_confirm(
         "budget_usd": budget_usd,
     }
     async with httpx.AsyncClient(timeout=DEFAULT_TIMEOUT) as client:
-        resp = await client.post(url, json=payload, headers=req_headers)
+        resp = await client.post(url, content=orjson.dumps(payload), headers=req_headers)
     resp.raise_for_status()
-    return PurchaseIntent.model_validate(resp.json())
+    return PurchaseIntent.model_validate_json(resp.content)
 
 
 async def call_sourcing(
@@ -104,13 +111,12 @@ async def call_sourcing(
         return await local_offers_for_intent(intent, top_k=top_k)
 
     url = f"{_AGENT_SOURCING_URL.rstrip('/')}/offers"
-    req_headers = _merge_headers({"Accept": "application/json"}, headers)
+    req_headers = _merge_headers(_JSON_HEADERS, headers)
     payload = {"intent": intent.model_dump(), "top_k": top_k}
     async with httpx.AsyncClient(timeout=DEFAULT_TIMEOUT) as client:
-        resp = await client.post(url, json=payload, headers=req_headers)
+        resp = await client.post(url, content=orjson.dumps(payload), headers=req_headers)
     resp.raise_for_status()
-    data = resp.json()
-    return [Offer.model_validate(item) for item in data]
+    return _OFFER_LIST.validate_json(resp.content)
 
 
 async def call_trust(
@@ -122,12 +128,12 @@ async def call_trust(
         return await local_assess(offer)
 
     url = f"{_AGENT_TRUST_URL.rstrip('/')}/assess"
-    req_headers = _merge_headers({"Accept": "application/json"}, headers)
+    req_headers = _merge_headers(_JSON_HEADERS, headers)
     payload = {"offer": offer.model_dump()}
     async with httpx.AsyncClient(timeout=DEFAULT_TIMEOUT) as client:
-        resp = await client.post(url, json=payload, headers=req_headers)
+        resp = await client.post(url, content=orjson.dumps(payload), headers=req_headers)
     resp.raise_for_status()
-    return TrustAssessment.model_validate(resp.json())
+    return TrustAssessment.model_validate_json(resp.content)
 
 
 async def call_checkout(
@@ -141,13 +147,13 @@ async def call_checkout(
         return await local_pay(offer, payment, idempotency_key)
 
     url = f"{_AGENT_CHECKOUT_URL.rstrip('/')}/pay"
-    req_headers = _merge_headers({"Accept": "application/json"}, headers)
+    req_headers = _merge_headers(_JSON_HEADERS, headers)
     payload = {
         "offer": offer.model_dump(),
         "payment": payment.model_dump(),
         "idempotency_key": idempotency_key or None,
     }
     async with httpx.AsyncClient(timeout=DEFAULT_TIMEOUT) as client:
-        resp = await client.post(url, json=payload, headers=req_headers)
+        resp = await client.post(url, content=orjson.dumps(payload), headers=req_headers)
     resp.raise_for_status()
-    return Receipt.model_validate(resp.json())
+    return Receipt.model_validate_json(resp.content)
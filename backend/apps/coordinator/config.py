@@ -1,27 +1,37 @@
-from typing import TypedDict
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping
 
-class StateCfg(TypedDict):
-    timeout_s: int
+
+@dataclass(frozen=True, slots=True)
+class StateCfg:
+    timeout_s: int  # per attempt
     retries: int
     tokens_est_k: float
     tokens_cap_k: float
+    budget_s: int  # whole stage: every attempt plus backoff, so retries can't stack up timeouts
 
-TIMEOUTS: dict[str, StateCfg] = {
-    "S1_CAPTURE": {"timeout_s": 12, "retries": 2, "tokens_est_k": 0.2, "tokens_cap_k": 0.8},
-    "S2_CONFIRM": {"timeout_s": 10, "retries": 2, "tokens_est_k": 0.3, "tokens_cap_k": 1.0},
-    "S3_SOURCING": {"timeout_s": 18, "retries": 2, "tokens_est_k": 0.5, "tokens_cap_k": 1.5},
-    "S4_TRUST": {"timeout_s": 12, "retries": 1, "tokens_est_k": 0.3, "tokens_cap_k": 1.2},
-    "S5_CHECKOUT": {"timeout_s": 16, "retries": 2, "tokens_est_k": 0.2, "tokens_cap_k": 0.8},
-}
+TIMEOUTS: Mapping[str, StateCfg] = MappingProxyType({
+    "S1_CAPTURE": StateCfg(timeout_s=12, retries=2, tokens_est_k=0.2, tokens_cap_k=0.8, budget_s=18),
+    "S2_CONFIRM": StateCfg(timeout_s=10, retries=2, tokens_est_k=0.3, tokens_cap_k=1.0, budget_s=15),
+    "S3_SOURCING": StateCfg(timeout_s=18, retries=2, tokens_est_k=0.5, tokens_cap_k=1.5, budget_s=27),
+    "S4_TRUST": StateCfg(timeout_s=12, retries=1, tokens_est_k=0.3, tokens_cap_k=1.2, budget_s=18),
+    "S5_CHECKOUT": StateCfg(timeout_s=16, retries=2, tokens_est_k=0.2, tokens_cap_k=0.8, budget_s=24),
+})
 # ---- Token Budgets & Policy ----
-TOKEN_BUDGETS = {
-    "S1": {"est": 400,  "cap": 800},   # Capture / Vision prompting (if any)
-    "S2": {"est": 700,  "cap": 1000},  # Intent
-    "S3": {"est": 1100, "cap": 1500},  # Sourcing (reranker)
-    "S4": {"est": 900,  "cap": 1200},  # Trust
-    "S5": {"est": 400,  "cap": 800},   # Checkout explanation
-}
+# Kept as read-only mappings (not dataclasses): per-request overrides arrive as
+# JSON dicts of the same shape and TokenBudgeter indexes both with ["cap"].
+TOKEN_BUDGETS: Mapping[str, Mapping[str, int]] = MappingProxyType({
+    "S1": MappingProxyType({"est": 400,  "cap": 800}),   # Capture / Vision prompting (if any)
+    "S2": MappingProxyType({"est": 700,  "cap": 1000}),  # Intent
+    "S3": MappingProxyType({"est": 1100, "cap": 1500}),  # Sourcing (reranker)
+    "S4": MappingProxyType({"est": 900,  "cap": 1200}),  # Trust
+    "S5": MappingProxyType({"est": 400,  "cap": 800}),   # Checkout explanation
+})
 # Policy when a call would exceed the cap: "warn" | "truncate" | "fallback" | "block"
 TOKEN_POLICY = "truncate"
 # Safety margin for completion tokens when truncating
 TOKEN_OUTPUT_SAFETY = 32
+# S4 skips the speculative runner-up trust check when S3's winner leads it by at
+# least this much score; compensation then fetches it on demand.
+S4_ALT_SKIP_SCORE_GAP = 0.25
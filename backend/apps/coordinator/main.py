@@ -1,10 +1,9 @@
 from __future__ import annotations
 
 import json
-import os
-import tempfile
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncGenerator, Dict, List, Optional
 
 from fastapi import APIRouter, FastAPI, File, Form, HTTPException, UploadFile, Header, Request
 from fastapi.middleware.cors import CORSMiddleware
@@ -29,8 +28,9 @@ from ...libs.schemas.models import (
     Receipt,
     TrustAssessment,
 )
+from ..coordinator.metrics import METRICS
 from ..coordinator.profile import DEFAULT_CHECKOUT_PROFILE
-from ..agent1_vision.main import intake_image
+from ..agent1_vision.main import intake_image_bytes
 from ..agent2_intent.main import propose_options
 from ..agent4_trust.main import assess as trust_assess
 from ..agent5_checkout.main import pay as checkout_pay
@@ -99,7 +99,15 @@ class PromptResponse(BaseModel):
     suggested_inputs: Dict[str, str] = {}
 
 
-app = FastAPI(title="Agentic Purchase - Agent Orchestrator")
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
+    # One eval.log writer for the whole process: sagas only enqueue events.
+    async with METRICS.event_writer():
+        _print_routes()
+        yield
+
+
+app = FastAPI(title="Agentic Purchase - Agent Orchestrator", lifespan=lifespan)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[
@@ -332,10 +340,8 @@ async def preview_saga(
     header_token_policy: Optional[str] = Header(default=None, alias="X-Token-Policy"),
     header_token_budgets: Optional[str] = Header(default=None, alias="X-Token-Budgets"),
 ):
-    suffix = os.path.splitext(image.filename or "")[1] or ".jpg"
-    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
-        tmp_file.write(await image.read())
-        tmp_path = tmp_file.name
+    image_bytes = await image.read()
+    image_name = image.filename or "upload.jpg"
 
     try:
         overrides = _parse_overrides(
@@ -351,7 +357,8 @@ async def preview_saga(
             header_token_budgets=header_token_budgets,
         )
         state = await graph_run_saga_preview_async(
-            image_path=tmp_path,
+            image_path=image_name,
+            image_bytes=image_bytes,
             user_text=user_text,
             preferred_offer_url=preferred_offer_url,
             **overrides,
@@ -371,17 +378,12 @@ async def preview_saga(
                     main_offer["image_url"] = base + iu
         except Exception:
             pass
-        result["profile"] = DEFAULT_CHECKOUT_PROFILE.model_copy()
+        result["profile"] = DEFAULT_CHECKOUT_PROFILE
         return result
     except HTTPException:
         raise
     except Exception as exc:
         raise HTTPException(status_code=500, detail=f"saga_preview_failed: {exc}") from exc
-    finally:
-        try:
-            os.remove(tmp_path)
-        except OSError:
-            pass
 
 
 @saga_router.post("/start", response_model=SagaResult)
@@ -407,10 +409,8 @@ async def start_saga(
     header_token_policy: Optional[str] = Header(default=None, alias="X-Token-Policy"),
     header_token_budgets: Optional[str] = Header(default=None, alias="X-Token-Budgets"),
 ):
-    suffix = os.path.splitext(image.filename or "")[1] or ".jpg"
-    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
-        tmp_file.write(await image.read())
-        tmp_path = tmp_file.name
+    image_bytes = await image.read()
+    image_name = image.filename or "upload.jpg"
 
     try:
         if not (card_number and expiry_mm_yy and cvv):
@@ -434,7 +434,8 @@ async def start_saga(
             header_token_budgets=header_token_budgets,
         )
         state = await graph_run_saga_async(
-            image_path=tmp_path,
+            image_path=image_name,
+            image_bytes=image_bytes,
             user_text=user_text,
             payment=payment,
             preferred_offer_url=preferred_offer_url,
@@ -456,17 +457,12 @@ async def start_saga(
                     main_offer["image_url"] = base + iu
         except Exception:
             pass
-        result["profile"] = DEFAULT_CHECKOUT_PROFILE.model_copy()
+        result["profile"] = DEFAULT_CHECKOUT_PROFILE
         return result
     except HTTPException:
         raise
     except Exception as exc:
         raise HTTPException(status_code=500, detail=f"saga_failed: {exc}") from exc
-    finally:
-        try:
-            os.remove(tmp_path)
-        except OSError:
-            pass
 
 
 app.include_router(saga_router)
@@ -474,13 +470,11 @@ app.include_router(saga_router)
 
 @app.post("/intent/prompt", response_model=PromptResponse)
 async def intent_prompt(image: UploadFile = File(...)):
-    suffix = os.path.splitext(image.filename or "")[1] or ".jpg"
-    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
-        tmp_file.write(await image.read())
-        tmp_path = tmp_file.name
+    image_bytes = await image.read()
+    image_name = image.filename or "upload.jpg"
 
     try:
-        hypo: ProductHypothesis = await intake_image(tmp_path)
+        hypo: ProductHypothesis = await intake_image_bytes(image_bytes, image_name)
         prompt_pack = propose_options(hypo)
         options = prompt_pack.get("options") or []
         if options and isinstance(options[0], str):
@@ -491,15 +485,9 @@ async def intent_prompt(image: UploadFile = File(...)):
         raise
     except Exception as exc:
         raise HTTPException(status_code=500, detail=f"intent_prompt_failed: {exc}") from exc
-    finally:
-        try:
-            os.remove(tmp_path)
-        except OSError:
-            pass
 
 
-@app.on_event("startup")
-async def _print_routes() -> None:
+def _print_routes() -> None:
     try:
         print("\n=== Registered routes ===")
         for route in app.routes:
@@ -1,12 +1,16 @@
 ﻿from __future__ import annotations
 
+import asyncio
 import json
 import time
 from collections import defaultdict, deque
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Any, Deque, Dict
+from typing import Any, AsyncIterator, Deque, Dict, Optional
 
 _MAX_SAMPLES = 500
+_EVENT_QUEUE_MAX = 1000
+_EVENT_BATCH = 64
 
 
 class _StateStats:
@@ -38,6 +42,10 @@ class Metrics:
         self._ranking_total = 0
         self._ranking_hits = 0
         self._events_logged = 0
+        self._events_dropped = 0
+        self._event_queue: Optional[asyncio.Queue] = None
+        self._event_worker: Optional[asyncio.Task] = None
+        self._writer_users = 0
         logs_dir = Path(__file__).resolve().parents[2] / "logs"
         logs_dir.mkdir(parents=True, exist_ok=True)
         self._eval_log = logs_dir / "eval.log"
@@ -93,11 +101,79 @@ class Metrics:
             self._ranking_hits += 1
 
     def log_event(self, payload: Dict[str, Any]):
+        self._write_events([payload])
+
+    def log_event_async(self, payload: Dict[str, Any]) -> None:
+        """Queue an event for the background writer without blocking the caller.
+
+        Falls back to a direct write when no writer is running (scripts, tests).
+        Events are dropped, and counted, if the queue is full.
+        """
+        queue = self._event_queue
+        if queue is None:
+            self.log_event(payload)
+            return
+        try:
+            queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            self._events_dropped += 1
+
+    @asynccontextmanager
+    async def event_writer(self) -> AsyncIterator[None]:
+        """Run the background eval.log writer for the lifetime of the context.
+
+        Nested and concurrent contexts share one writer; the last one to exit
+        flushes everything still queued and stops it. Services should hold it
+        for their whole lifespan so request paths only enqueue.
+        """
+        self._writer_users += 1
+        if self._writer_users == 1:
+            queue: asyncio.Queue = asyncio.Queue(maxsize=_EVENT_QUEUE_MAX)
+            self._event_worker = asyncio.create_task(self._drain_events(queue))
+            self._event_queue = queue
+        try:
+            yield
+        finally:
+            self._writer_users -= 1
+            if self._writer_users == 0:
+                queue, worker = self._event_queue, self._event_worker
+                self._event_queue = self._event_worker = None
+                try:
+                    await queue.join()
+                finally:
+                    worker.cancel()
+                    await asyncio.gather(worker, return_exceptions=True)
+                    # Cancelled mid-flush: write what the worker never picked up.
+                    leftover = []
+                    while not queue.empty():
+                        leftover.append(queue.get_nowait())
+                    if leftover:
+                        self._write_events(leftover)
+
+    async def _drain_events(self, queue: asyncio.Queue) -> None:
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < _EVENT_BATCH and not queue.empty():
+                batch.append(queue.get_nowait())
+            try:
+                await asyncio.to_thread(self._write_events, batch)
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    def _write_events(self, payloads: list[Dict[str, Any]]) -> None:
+        lines = []
+        for payload in payloads:
+            try:
+                lines.append(json.dumps(payload, default=_json_serialize, ensure_ascii=False) + "\n")
+            except Exception:
+                pass
+        if not lines:
+            return
         try:
-            line = json.dumps(payload, default=_json_serialize, ensure_ascii=False)
             with self._eval_log.open("a", encoding="utf-8") as fh:
-                fh.write(line + "\n")
-            self._events_logged += 1
+                fh.write("".join(lines))
+            self._events_logged += len(lines)
         except Exception:
             pass
 
@@ -117,6 +193,7 @@ class Metrics:
                 "accuracy": _ratio(self._ranking_hits, self._ranking_total),
             },
             "events_logged": self._events_logged,
+            "events_dropped": self._events_dropped,
             "log_path": str(self._eval_log),
         }
 
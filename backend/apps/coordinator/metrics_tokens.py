@@ -1,5 +1,6 @@
 ﻿from __future__ import annotations
 from dataclasses import dataclass, asdict
+from functools import lru_cache
 from typing import Dict, Optional
 import hashlib, json, os, time
 
@@ -20,12 +21,16 @@ def count_tokens(model: str, text: str) -> int:
         return 0
     if tiktoken is None or not model or ("gpt" not in model):
         return _rough_tokens(text)
+    return len(_encoding(model).encode(text))
+
+
+@lru_cache(maxsize=16)
+def _encoding(model: str):
+    # Encoder construction dominates a count; build each one once per process.
     try:
-        enc = tiktoken.encoding_for_model(model)
+        return tiktoken.encoding_for_model(model)
     except Exception:
-        from tiktoken import get_encoding  # type: ignore
-        enc = get_encoding("cl100k_base")
-    return len(enc.encode(text))
+        return tiktoken.get_encoding("cl100k_base")
 
 
 @dataclass
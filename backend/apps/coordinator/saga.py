@@ -1,11 +1,13 @@
 # apps/coordinator/saga.py
 import asyncio
+import functools
 import time
 from typing import Optional, Dict, Any, Tuple
 
 from fastapi import HTTPException
 from ...libs.utils.logging import logger
-from .config import TIMEOUTS
+from ...libs.utils.retry import CircuitBreaker, call_with_retry
+from .config import S4_ALT_SKIP_SCORE_GAP, TIMEOUTS
 from ...libs.schemas.models import (
     ProductHypothesis,
     PurchaseIntent,
@@ -14,6 +16,7 @@ from ...libs.schemas.models import (
     PaymentInput,
     Receipt,
 )
+from ..agent2_intent.main import _langchain_enabled as _intent_langchain_enabled, rule_based_intent
 from .clients import (
     call_checkout,
     call_intent_confirm,
@@ -38,27 +41,94 @@ class SagaLog:
 
 async def with_timeout(fn, state_key: str, *args, **kwargs):
     """Run an async function with the state's configured timeout."""
+    async with asyncio.timeout(TIMEOUTS[state_key].timeout_s):
+        return await fn(*args, **kwargs)
+
+
+# One breaker per stage: a provider that keeps timing out fails fast instead.
+_BREAKERS: Dict[str, CircuitBreaker] = {state: CircuitBreaker(state) for state in TIMEOUTS}
+
+
+async def retryable_call(fn, state_key: str, *args, retries: Optional[int] = None, **kwargs):
+    """with_timeout plus backoff retries on transient errors, behind the state's breaker.
+
+    ``retries`` defaults to the state's configured count; all attempts together
+    are capped at the state's ``budget_s``.
+    """
     cfg = TIMEOUTS[state_key]
-    return await asyncio.wait_for(fn(*args, **kwargs), timeout=cfg["timeout_s"])
+    return await call_with_retry(
+        with_timeout,
+        fn,
+        state_key,
+        *args,
+        retries=cfg.retries if retries is None else retries,
+        breaker=_BREAKERS[state_key],
+        deadline_s=cfg.budget_s,
+        **kwargs,
+    )
 
 
 async def _timeit(state: str, coro) -> Tuple[Optional[Any], float, Optional[Exception]]:
     """Measure coroutine wall time, record metrics, and return (result, dt, error)."""
-    t0 = time.time()
+    t0 = time.monotonic()
     try:
         out = await coro
-        dt = time.time() - t0
+        dt = time.monotonic() - t0
         METRICS.record(state, dt_s=dt, ok=True)
         return out, dt, None
     except Exception as e:  # noqa: BLE001 – we want to capture any error and pass up
-        dt = time.time() - t0
+        dt = time.monotonic() - t0
         METRICS.record(state, dt_s=dt, ok=False)
         return None, dt, e
 
 
+def _fast_intent_guess(hypo: ProductHypothesis, user_text: Optional[str]) -> Optional[PurchaseIntent]:
+    """Cheap local prediction of S2's intent, used to start S3 speculatively.
+
+    None when S2 runs the LangChain intent chain: its output rarely equals the
+    rule-based guess, so speculating would only burn a sourcing call.
+    """
+    if _intent_langchain_enabled():
+        return None
+    try:
+        return rule_based_intent(hypo, user_text)
+    except Exception:
+        return None
+
+
+async def _settle(fn, *args, **kwargs) -> Tuple[Optional[Any], float, Optional[Exception]]:
+    """Run a speculative call and return (result, dt, error) instead of raising.
+
+    Like _timeit, but records no metrics: a speculation only counts once it is
+    used. A failed speculation must not abort the TaskGroup it runs in. The call
+    is only created once the task starts, so cancelling it early leaves nothing
+    un-awaited.
+    """
+    t0 = time.monotonic()
+    try:
+        out = await fn(*args, **kwargs)
+        return out, time.monotonic() - t0, None
+    except Exception as e:  # noqa: BLE001
+        return None, time.monotonic() - t0, e
+
+
+def _with_event_writer(fn):
+    """Run ``fn`` with METRICS' background event writer active.
+
+    Services start the writer once in their lifespan, so this only joins it;
+    scripts calling ``run_saga`` directly get a writer that is flushed on return.
+    """
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        async with METRICS.event_writer():
+            return await fn(*args, **kwargs)
+    return wrapper
+
+
 # ----------------------
 # Saga (S1..S5)
 # ----------------------
+@_with_event_writer
 async def run_saga(
     image_filename: str,
     user_text: Optional[str],
@@ -97,7 +167,7 @@ async def run_saga(
 
     # --- S1: Capture / Intake ---
     hypo, dt, err = await _timeit(
-        "S1_CAPTURE", with_timeout(call_vision, "S1_CAPTURE", image_filename, headers=headers)
+        "S1_CAPTURE", retryable_call(call_vision, "S1_CAPTURE", image_filename, headers=headers)
     )
     if err:
         log.add("S1_CAPTURE", {"ok": False, "error": str(err), "dt_s": round(dt, 4)})
@@ -108,13 +178,15 @@ async def run_saga(
         "S1_CAPTURE",
         {"ok": True, "brand": hypo.brand, "label": hypo.label, "dt_s": round(dt, 4)},
     )
+    # JSON dumps are taken once per stage and reused by every metrics payload below.
+    hypo_json = hypo.model_dump(mode="json")
     try:
-        METRICS.log_event(
+        METRICS.log_event_async(
             {
                 "event": "S1_CAPTURE",
                 "ok": True,
                 "dt_s": round(dt, 4),
-                "hypothesis": hypo.model_dump(mode="json"),
+                "hypothesis": hypo_json,
                 "headers": headers if headers else None,
             }
         )
@@ -122,16 +194,40 @@ async def run_saga(
         pass
 
     # --- S2: Intent Confirmation ---
-    intent, dt, err = await _timeit(
-        "S2_CONFIRM",
-        with_timeout(
-            call_intent_confirm,
+    # Start sourcing for the locally predicted intent while S2 runs; S3 reuses
+    # it only if S2 confirms exactly that intent.
+    # The TaskGroup cancels and awaits the speculation on every exit path.
+    # The speculation bypasses retries and the S3 breaker so a miss or a failed
+    # guess never counts against the provider; S3 then runs normally.
+    intent_guess = _fast_intent_guess(hypo, user_text)
+    s3_result: Optional[Tuple[Optional[Any], float, Optional[Exception]]] = None
+    async with asyncio.TaskGroup() as tg:
+        s3_spec_task = None
+        if intent_guess is not None:
+            s3_spec_task = tg.create_task(
+                _settle(with_timeout, call_sourcing, "S3_SOURCING", intent_guess, headers=headers)
+            )
+        intent, dt, err = await _timeit(
             "S2_CONFIRM",
-            hypo,
-            user_text=user_text,
-            headers=headers,
-        ),
-    )
+            retryable_call(
+                call_intent_confirm,
+                "S2_CONFIRM",
+                hypo,
+                user_text=user_text,
+                headers=headers,
+            ),
+        )
+        if s3_spec_task is not None:
+            # The whole intent must match: the LLM reranker sees every field, not just the filters.
+            if err is None and intent == intent_guess:
+                spec_offers, spec_dt, spec_err = await s3_spec_task
+                # A failed guess had no retries; leave it to the regular S3 call below.
+                if spec_err is None:
+                    # spec_dt is the task's own call time, not just the wait left after S2.
+                    METRICS.record("S3_SOURCING", dt_s=spec_dt, ok=True)
+                    s3_result = (spec_offers, spec_dt, None)
+            else:
+                s3_spec_task.cancel()
     if err:
         log.add("S2_CONFIRM", {"ok": False, "error": str(err), "dt_s": round(dt, 4)})
         logger.exception("S2_CONFIRM_failed")
@@ -141,40 +237,42 @@ async def run_saga(
         "S2_CONFIRM",
         {"ok": True, "intent": intent.model_dump(), "dt_s": round(dt, 4)},
     )
+    intent_json = intent.model_dump(mode="json")
     try:
-        METRICS.record_recognition(
-            hypothesis=hypo.model_dump(mode="json"),
-            intent=intent.model_dump(mode="json"),
-        )
-        METRICS.log_event(
+        METRICS.record_recognition(hypothesis=hypo_json, intent=intent_json)
+        METRICS.log_event_async(
             {
                 "event": "S2_CONFIRM",
                 "ok": True,
                 "dt_s": round(dt, 4),
-                "intent": intent.model_dump(mode="json"),
+                "intent": intent_json,
             }
         )
     except Exception:
         pass
 
     # --- S3: Product Sourcing ---
-    offers, dt, err = await _timeit(
-        "S3_SOURCING",
-        with_timeout(call_sourcing, "S3_SOURCING", intent, headers=headers),
-    )
+    if s3_result is None:
+        s3_result = await _timeit(
+            "S3_SOURCING",
+            retryable_call(call_sourcing, "S3_SOURCING", intent, headers=headers),
+        )
+    offers, dt, err = s3_result
     if err or not offers:
         msg = str(err) if err else "no offers"
         log.add("S3_SOURCING", {"ok": False, "error": msg, "dt_s": round(dt, 4)})
         logger.error("S3_SOURCING_failed: %s", msg)
         raise HTTPException(status_code=504, detail=f"S3 failed: {msg}")
     assert isinstance(offers, list) and isinstance(offers[0], Offer)
-    best: Offer = offers[0]
+    # Track the winner by position so the final reorder needs no Pydantic equality scan.
+    best_idx = 0
     if preferred_offer_url:
         target = preferred_offer_url.rstrip("/").lower()
-        for candidate in offers:
+        for idx, candidate in enumerate(offers):
             if candidate.url.rstrip("/").lower() == target:
-                best = candidate
+                best_idx = idx
                 break
+    best: Offer = offers[best_idx]
     log.add(
         "S3_SOURCING",
         {
@@ -184,57 +282,87 @@ async def run_saga(
             "dt_s": round(dt, 4),
         },
     )
+    offers_json = [offer.model_dump(mode="json") for offer in offers]
     try:
-        METRICS.record_ranking([offer.model_dump(mode="json") for offer in offers])
-        METRICS.log_event(
+        METRICS.record_ranking(offers_json)
+        METRICS.log_event_async(
             {
                 "event": "S3_SOURCING",
                 "ok": True,
                 "dt_s": round(dt, 4),
-                "offers": [offer.model_dump(mode="json") for offer in offers],
+                "offers": offers_json,
             }
         )
     except Exception:
         pass
 
     # --- S4: Trust & Safety ---
-    trust, dt, err = await _timeit(
-        "S4_TRUST",
-        with_timeout(call_trust, "S4_TRUST", best, headers=headers),
-    )
+    # Speculatively assess the runner-up alongside the primary check so the
+    # compensation branch below adds no extra round-trip when it is taken.
+    # A clear score winner rarely needs compensating, so skip the prefetch then;
+    # compensation still fetches the runner-up on demand.
+    # The runner-up is the first offer other than the pick, which
+    # preferred_offer_url may have moved off index 0.
+    alt_idx = (1 if best_idx == 0 else 0) if len(offers) > 1 else None
+    alt: Optional[Offer] = offers[alt_idx] if alt_idx is not None else None
+    prefetch_alt = alt is not None and best.score - alt.score < S4_ALT_SKIP_SCORE_GAP
+    if alt is not None and not prefetch_alt:
+        METRICS.record("S4_ALT_SKIPPED", dt_s=None, ok=True)
+    alt_result: Optional[Tuple[Optional[Any], float, Optional[Exception]]] = None
+    async with asyncio.TaskGroup() as tg:
+        alt_task = None
+        if prefetch_alt:
+            alt_task = tg.create_task(
+                _settle(retryable_call, call_trust, "S4_TRUST", alt, headers=headers)
+            )
+        trust, dt, err = await _timeit(
+            "S4_TRUST",
+            retryable_call(call_trust, "S4_TRUST", best, headers=headers),
+        )
+        needs_alt = err is None and trust.risk in ("medium", "high") and alt is not None
+        t1 = time.monotonic()
+        if alt_task is not None:
+            if needs_alt:
+                alt_result = await alt_task
+            else:
+                alt_task.cancel()
     if err:
         log.add("S4_TRUST", {"ok": False, "error": str(err), "dt_s": round(dt, 4)})
         logger.exception("S4_TRUST_failed")
         raise HTTPException(status_code=504, detail=f"S4 failed: {err}")
     assert isinstance(trust, TrustAssessment)
     log.add("S4_TRUST", {"ok": True, "risk": trust.risk, "dt_s": round(dt, 4)})
+    trust_json = trust.model_dump(mode="json")
     try:
-        METRICS.log_event(
+        METRICS.log_event_async(
             {
                 "event": "S4_TRUST",
                 "ok": True,
                 "dt_s": round(dt, 4),
-                "trust": trust.model_dump(mode="json"),
+                "trust": trust_json,
             }
         )
     except Exception:
         pass
 
     # Simple compensation: if risky and we have a second-best option, try that
-    if trust.risk in ("medium", "high") and len(offers) > 1:
-        t1 = time.time()
-        alt = offers[1]
+    if needs_alt:
+        if alt_result is None:
+            alt_result = await _settle(retryable_call, call_trust, "S4_TRUST", alt, headers=headers)
         try:
-            alt_trust = await call_trust(alt, headers=headers)
+            alt_trust, _, alt_err = alt_result
+            if alt_err is not None:
+                raise alt_err
             if alt_trust.risk < trust.risk:
-                best = alt
+                best, best_idx = alt, alt_idx
                 trust = alt_trust
+                trust_json = trust.model_dump(mode="json")
                 log.add(
                     "S4_COMPENSATE",
                     {
                         "picked_next_best": True,
                         "risk": trust.risk,
-                        "extra_ms": int((time.time() - t1) * 1000),
+                        "extra_ms": int((time.monotonic() - t1) * 1000),
                     },
                 )
         except Exception as e:
@@ -244,15 +372,18 @@ async def run_saga(
                 {
                     "picked_next_best": False,
                     "error": f"assess_alt_failed: {e}",
-                    "extra_ms": int((time.time() - t1) * 1000),
+                    "extra_ms": int((time.monotonic() - t1) * 1000),
                 },
             )
 
     # Ensure the winning offer is the first entry so downstream consumers can rely on ordering.
-    if offers and offers[0] != best:
-        offers = [best] + [offer for offer in offers if offer != best]
+    if best_idx:
+        offers.insert(0, offers.pop(best_idx))
+        # Rebind rather than mutate: the queued S3_SOURCING event still holds the old list.
+        offers_json = [offers_json[best_idx], *offers_json[:best_idx], *offers_json[best_idx + 1:]]
 
     receipt: Optional[Receipt] = None
+    receipt_json: Optional[Dict[str, Any]] = None
     if auto_checkout:
         # --- S5: Checkout / Payment ---
         # Amount is driven by the selected offer; let the payment layer validate card, luhn, etc.
@@ -260,11 +391,13 @@ async def run_saga(
         payment.amount_usd = best.price_usd
         receipt, dt, err = await _timeit(
             "S5_CHECKOUT",
-            with_timeout(
+            retryable_call(
                 call_checkout,
                 "S5_CHECKOUT",
                 best,
                 payment,
+                # Payment has side effects: only retry when the idempotency key makes it safe.
+                retries=None if idempotency_key else 0,
                 idempotency_key=idempotency_key or "",  # keep API stable even if None
                 headers=headers,
             ),
@@ -279,13 +412,14 @@ async def run_saga(
             "S5_CHECKOUT",
             {"ok": True, "receipt": receipt.model_dump(), "dt_s": round(dt, 4)},
         )
+        receipt_json = receipt.model_dump(mode="json")
         try:
-            METRICS.log_event(
+            METRICS.log_event_async(
                 {
                     "event": "S5_CHECKOUT",
                     "ok": True,
                     "dt_s": round(dt, 4),
-                    "receipt": receipt.model_dump(mode="json"),
+                    "receipt": receipt_json,
                 }
             )
         except Exception:
@@ -314,18 +448,18 @@ async def run_saga(
         payload = {
             "event": "SAGA_COMPLETE",
             "ok": True,
-            "hypothesis": hypo.model_dump(mode="json"),
-            "intent": intent.model_dump(mode="json"),
-            "offer": best.model_dump(mode="json"),
-            "trust": trust.model_dump(mode="json"),
-            "offers": [offer.model_dump(mode="json") for offer in offers],
+            "hypothesis": hypo_json,
+            "intent": intent_json,
+            "offer": offers_json[0],
+            "trust": trust_json,
+            "offers": offers_json,
             "idempotency_key": idempotency_key,
             "auto_checkout": auto_checkout,
             "preferred_offer_url": preferred_offer_url,
         }
-        if receipt is not None:
-            payload["receipt"] = receipt.model_dump(mode="json")
-        METRICS.log_event(payload)
+        if receipt_json is not None:
+            payload["receipt"] = receipt_json
+        METRICS.log_event_async(payload)
     except Exception:
         pass
     return out
@@ -1,17 +1,19 @@
 from __future__ import annotations
 
-import json
+from functools import lru_cache
 from typing import Any
 
+import orjson
 from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_core.output_parsers import PydanticOutputParser
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.runnables import RunnableConfig
+from langchain_core.runnables import Runnable, RunnableConfig
 
 from ..schemas.models import ProductHypothesis, PurchaseIntent
 from .llm import get_chat_model
 
 _parser = PydanticOutputParser(pydantic_object=PurchaseIntent)
+_FORMAT_INSTRUCTIONS = _parser.get_format_instructions()
 
 _SYSTEM_TMPL = (
     "You are a shopping assistant converting observations from a vision system and a user's request "
@@ -40,6 +42,11 @@ def _ensure_llm(model: str | None = None) -> BaseChatModel:
     return get_chat_model(feature="intent", explicit_model=model)
 
 
+@lru_cache(maxsize=8)
+def _chain_for(model: str | None) -> Runnable:
+    return _PROMPT | _ensure_llm(model) | _parser
+
+
 async def run_intent_chain(
     hypothesis: ProductHypothesis,
     user_request: str | None,
@@ -56,13 +63,12 @@ async def run_intent_chain(
         model: Optional override for the LLM model name.
         config: Optional RunnableConfig overrides passed to the chain (e.g., callbacks, tags).
     """
-    llm = _ensure_llm(model)
-    chain = _PROMPT | llm | _parser
+    chain = _chain_for(model)
     payload = {
-        "hypothesis_json": json.dumps(
-            hypothesis.model_dump(mode="json"), indent=2, ensure_ascii=False
-        ),
+        "hypothesis_json": orjson.dumps(
+            hypothesis.model_dump(mode="json"), option=orjson.OPT_INDENT_2
+        ).decode(),
         "user_request": (user_request or "").strip(),
-        "format_instructions": _parser.get_format_instructions(),
+        "format_instructions": _FORMAT_INSTRUCTIONS,
     }
     return await chain.ainvoke(payload, config=config)
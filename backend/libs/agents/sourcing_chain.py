@@ -2,11 +2,16 @@
 
 import os
 import json
-from typing import Any, List
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, List, Tuple
 
+import orjson
 from langchain_core.output_parsers import PydanticOutputParser
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.runnables import RunnableConfig
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.runnables import Runnable, RunnableConfig
 from pydantic import BaseModel, Field
 
 from ..schemas.models import Offer, PurchaseIntent
@@ -26,6 +31,7 @@ class OfferRanking(BaseModel):
 
 
 _parser = PydanticOutputParser(pydantic_object=OfferRanking)
+_FORMAT_INSTRUCTIONS = _parser.get_format_instructions()
 
 _PROMPT = ChatPromptTemplate.from_messages(
     [
@@ -46,6 +52,47 @@ _PROMPT = ChatPromptTemplate.from_messages(
 )
 
 
+_RANK_CACHE_MAX = 256
+_RANK_CACHE_TTL_S = 300.0
+# (intent json, offer urls) -> (stored_at, ranked order); LRU-ordered, oldest first.
+_RANK_CACHE: "OrderedDict[Tuple[str, Tuple[str, ...]], Tuple[float, Tuple[int, ...]]]" = OrderedDict()
+
+
+def _cached_order(key: Tuple[str, Tuple[str, ...]]) -> Tuple[int, ...] | None:
+    entry = _RANK_CACHE.get(key)
+    if entry is None:
+        return None
+    stored_at, order = entry
+    if time.monotonic() - stored_at > _RANK_CACHE_TTL_S:
+        del _RANK_CACHE[key]
+        return None
+    _RANK_CACHE.move_to_end(key)
+    return order
+
+
+def _store_order(key: Tuple[str, Tuple[str, ...]], order: Tuple[int, ...]) -> None:
+    _RANK_CACHE[key] = (time.monotonic(), order)
+    _RANK_CACHE.move_to_end(key)
+    while len(_RANK_CACHE) > _RANK_CACHE_MAX:
+        _RANK_CACHE.popitem(last=False)
+
+
+@lru_cache(maxsize=1)
+def _llm() -> BaseChatModel:
+    return get_chat_model(feature="sourcing")
+
+
+@lru_cache(maxsize=1)
+def _chain() -> Runnable:
+    return _PROMPT | _llm() | _parser
+
+
+@lru_cache(maxsize=8)
+def _format_instruction_tokens(model_name: str) -> int:
+    from apps.coordinator.metrics_tokens import count_tokens
+    return count_tokens(model_name, _FORMAT_INSTRUCTIONS)
+
+
 async def rerank_offers_with_llm(
     intent: PurchaseIntent,
     offers: list[Offer],
@@ -57,12 +104,19 @@ async def rerank_offers_with_llm(
     """
     Reorder offers using an LLM ranking chain. Returns the reordered list.
     If a token budgeter is provided, apply budget enforcement and token accounting.
+    Rankings are memoized per (intent, offer urls) for a few minutes, so repeated
+    previews of the same search skip the LLM call (and its token charge) entirely.
     """
     if len(offers) <= 1:
         return offers
 
-    llm = get_chat_model(feature="sourcing")
-    chain = _PROMPT | llm | _parser
+    cache_key = (intent.model_dump_json(), tuple(offer.url for offer in offers))
+    cached = _cached_order(cache_key)
+    if cached is not None:
+        return [offers[i] for i in cached]
+
+    llm = _llm()
+    chain = _chain()
 
     enriched = [
         {
@@ -78,9 +132,9 @@ async def rerank_offers_with_llm(
         for idx, offer in enumerate(offers)
     ]
     payload = {
-        "intent_json": json.dumps(intent.model_dump(mode="json"), indent=2, ensure_ascii=False),
-        "offers_json": json.dumps(enriched, indent=2, ensure_ascii=False),
-        "format_instructions": _parser.get_format_instructions(),
+        "intent_json": orjson.dumps(intent.model_dump(mode="json"), option=orjson.OPT_INDENT_2).decode(),
+        "offers_json": orjson.dumps(enriched, option=orjson.OPT_INDENT_2).decode(),
+        "format_instructions": _FORMAT_INSTRUCTIONS,
     }
 
     result = None
@@ -89,8 +143,12 @@ async def rerank_offers_with_llm(
     if budgeter is not None:
         try:
             from apps.coordinator.metrics_tokens import count_tokens
-            prompt_text = json.dumps(payload, ensure_ascii=False)
-            prompt_tokens = count_tokens(model_name, prompt_text)
+            # Count the rendered pieces directly; the format instructions never change.
+            prompt_tokens = (
+                count_tokens(model_name, payload["intent_json"])
+                + count_tokens(model_name, payload["offers_json"])
+                + _format_instruction_tokens(model_name)
+            )
             act = budgeter.enforce_before_call(state, prompt_tokens)
             if act == "block":
                 raise RuntimeError("token_budget_block: S3")
@@ -135,4 +193,5 @@ async def rerank_offers_with_llm(
         if idx not in seen:
             order.append(idx)
 
+    _store_order(cache_key, tuple(order))
     return [offers[i] for i in order]
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
-import json
+from functools import lru_cache
 from typing import Any
 
+import orjson
 from langchain_core.output_parsers import PydanticOutputParser
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.runnables import RunnableConfig
+from langchain_core.runnables import Runnable, RunnableConfig
 from pydantic import BaseModel, Field
 
 from ..schemas.models import Offer, TrustAssessment
@@ -18,6 +19,7 @@ class TrustDecision(BaseModel):
 
 
 _parser = PydanticOutputParser(pydantic_object=TrustDecision)
+_FORMAT_INSTRUCTIONS = _parser.get_format_instructions()
 
 _PROMPT = ChatPromptTemplate.from_messages(
     [
@@ -36,6 +38,11 @@ _PROMPT = ChatPromptTemplate.from_messages(
 )
 
 
+@lru_cache(maxsize=1)
+def _chain() -> Runnable:
+    return _PROMPT | get_chat_model(feature="trust") | _parser
+
+
 async def llm_adjust_trust(
     offer: Offer,
     assessment: TrustAssessment,
@@ -43,13 +50,12 @@ async def llm_adjust_trust(
     *,
     config: RunnableConfig | dict[str, Any] | None = None,
 ) -> TrustAssessment:
-    llm = get_chat_model(feature="trust")
-    chain = _PROMPT | llm | _parser
+    chain = _chain()
     payload = {
-        "offer_json": json.dumps(offer.model_dump(mode="json"), indent=2, ensure_ascii=False),
-        "profile_json": json.dumps(profile, indent=2, ensure_ascii=False),
+        "offer_json": orjson.dumps(offer.model_dump(mode="json"), option=orjson.OPT_INDENT_2).decode(),
+        "profile_json": orjson.dumps(profile, option=orjson.OPT_INDENT_2).decode(),
         "baseline_risk": assessment.risk,
-        "format_instructions": _parser.get_format_instructions(),
+        "format_instructions": _FORMAT_INSTRUCTIONS,
     }
     decision = await chain.ainvoke(payload, config=config)
     risk_normalized = decision.risk.strip().lower()
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
-import json
+from functools import lru_cache
 from typing import Any
 
+import orjson
 from langchain_core.output_parsers import PydanticOutputParser
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.runnables import RunnableConfig
+from langchain_core.runnables import Runnable, RunnableConfig
 from pydantic import BaseModel, Field
 
 from ..schemas.models import ProductHypothesis
@@ -37,6 +38,7 @@ class VisionRefinement(BaseModel):
 
 
 _parser = PydanticOutputParser(pydantic_object=VisionRefinement)
+_FORMAT_INSTRUCTIONS = _parser.get_format_instructions()
 
 _PROMPT = ChatPromptTemplate.from_messages(
     [
@@ -58,18 +60,22 @@ _PROMPT = ChatPromptTemplate.from_messages(
 )
 
 
+@lru_cache(maxsize=1)
+def _chain() -> Runnable:
+    return _PROMPT | get_chat_model(feature="vision") | _parser
+
+
 async def refine_hypothesis_with_llm(
     base: ProductHypothesis,
     evidence: dict[str, Any] | None = None,
     *,
     config: RunnableConfig | dict[str, Any] | None = None,
 ) -> ProductHypothesis:
-    llm = get_chat_model(feature="vision")
-    chain = _PROMPT | llm | _parser
+    chain = _chain()
     payload = {
-        "base_hypothesis": json.dumps(base.model_dump(mode="json"), indent=2, ensure_ascii=False),
-        "evidence": json.dumps(evidence or {}, indent=2, ensure_ascii=False),
-        "format_instructions": _parser.get_format_instructions(),
+        "base_hypothesis": orjson.dumps(base.model_dump(mode="json"), option=orjson.OPT_INDENT_2).decode(),
+        "evidence": orjson.dumps(evidence or {}, option=orjson.OPT_INDENT_2).decode(),
+        "format_instructions": _FORMAT_INSTRUCTIONS,
     }
     refined = await chain.ainvoke(payload, config=config)
 
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
-import json
 import os
 import re
+import sys
 from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, NamedTuple
+
+import numpy as np
+import orjson
 
 from ..schemas.models import Offer, PurchaseIntent
 
@@ -15,6 +18,12 @@ ABO_OFFERS_PATH = os.getenv(
     str(Path(__file__).resolve().parents[2] / "data" / "abo_offers.jsonl"),
 )
 
+_TOKEN_RE = re.compile(r"[^a-z0-9]+")
+_PHONE_MARKERS = frozenset({"phone", "iphone", "samsung", "pixel", "oneplus", "xiaomi", "redmi"})
+_ACCESSORY_MARKERS = frozenset({"case", "cover", "bumper", "sleeve"})
+_ACCESSORY_TERMS = ("case", "cover", "bumper", "sleeve", "screen protector")
+_INTERNED_FIELDS = ("vendor", "category")  # few distinct values repeated across every row
+
 
 @lru_cache(maxsize=1)
 def _load_offers() -> List[Dict[str, Any]]:
@@ -22,25 +31,63 @@ def _load_offers() -> List[Dict[str, Any]]:
     if not path.exists():
         return []
     offers: List[Dict[str, Any]] = []
-    with path.open("r", encoding="utf-8") as fh:
+    with path.open("rb") as fh:
         for line in fh:
             if not line.strip():
                 continue
-            data = json.loads(line)
+            data = orjson.loads(line)
             if isinstance(data, dict):
+                for field in _INTERNED_FIELDS:
+                    value = data.get(field)
+                    if isinstance(value, str):
+                        data[field] = sys.intern(value)
                 offers.append(data)
     return offers
 
 
+class _CatalogIndex(NamedTuple):
+    """Column-oriented view of the ABO catalog for vectorized scoring."""
+
+    title_postings: Dict[str, np.ndarray]  # token -> offer indices whose title contains it
+    keyword_postings: Dict[str, np.ndarray]  # token -> offer index per keyword containing it
+    vendor_lower: np.ndarray
+    title_lower: np.ndarray
+    prices: np.ndarray  # NaN where the offer has no price
+    accessory: np.ndarray  # True for cases/covers/protectors
+
+
+def _postings(buckets: Dict[str, List[int]]) -> Dict[str, np.ndarray]:
+    return {tok: np.asarray(idxs, dtype=np.intp) for tok, idxs in buckets.items()}
+
+
+@lru_cache(maxsize=1)
+def _catalog_index() -> _CatalogIndex:
+    offers = _load_offers()
+    title_buckets: Dict[str, List[int]] = {}
+    keyword_buckets: Dict[str, List[int]] = {}
+    for idx, offer in enumerate(offers):
+        for tok in set(_tokens(offer.get("title") or "")):
+            title_buckets.setdefault(tok, []).append(idx)
+        for kw in offer.get("keywords") or []:
+            for tok in set(_tokens(kw)):
+                keyword_buckets.setdefault(tok, []).append(idx)
+    prices = [offer.get("price_usd") for offer in offers]
+    return _CatalogIndex(
+        title_postings=_postings(title_buckets),
+        keyword_postings=_postings(keyword_buckets),
+        vendor_lower=np.array([(offer.get("vendor") or "").lower() for offer in offers], dtype=str),
+        title_lower=np.array([(offer.get("title") or "").lower() for offer in offers], dtype=str),
+        prices=np.array([p if isinstance(p, (int, float)) else np.nan for p in prices], dtype=float),
+        accessory=np.fromiter((_is_accessory(offer) for offer in offers), dtype=bool, count=len(offers)),
+    )
+
+
 def _tokens(text: str) -> List[str]:
-    return [tok for tok in re.split(r"[^a-z0-9]+", text.lower()) if tok]
+    return [tok for tok in _TOKEN_RE.split(text.lower()) if tok]
 
 
-def _is_phone_like(pi: PurchaseIntent) -> bool:
-    tokens = _tokens(pi.item_name or "")
-    phone_markers = {"phone", "iphone", "samsung", "pixel", "oneplus", "xiaomi", "redmi"}
-    accessory_markers = {"case", "cover", "bumper", "sleeve"}
-    return bool(tokens & phone_markers) and not bool(tokens & accessory_markers)
+def _is_phone_like(q_tokens: frozenset[str]) -> bool:
+    return not q_tokens.isdisjoint(_PHONE_MARKERS) and q_tokens.isdisjoint(_ACCESSORY_MARKERS)
 
 
 def _is_accessory(offer: Dict[str, Any]) -> bool:
@@ -51,41 +98,58 @@ def _is_accessory(offer: Dict[str, Any]) -> bool:
           offer.get("category") or "",
         ]
     ).lower()
-    return any(term in text for term in ["case", "cover", "bumper", "sleeve", "screen protector"])
+    return any(term in text for term in _ACCESSORY_TERMS)
+
+
+def _top_k(pool: np.ndarray, pool_scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the ``k`` best scores in ``pool``, ties broken by catalog order.
+
+    Matches a stable descending sort truncated to ``k`` without sorting the
+    whole pool: a partition finds the k-th score, and only the survivors are
+    sorted.
+    """
+    if len(pool) > k > 0:
+        kth = -np.partition(-pool_scores, k - 1)[k - 1]
+        above = pool_scores > kth
+        ties = np.flatnonzero(pool_scores == kth)[: k - int(above.sum())]
+        above[ties] = True
+        pool, pool_scores = pool[above], pool_scores[above]
+    return pool[np.argsort(-pool_scores, kind="stable")][:k]
 
 
 def search_abo_offers(pi: PurchaseIntent, top_k: int = 8) -> List[Dict[str, Any]]:
     offers = _load_offers()
     if not offers:
         return []
-    q_tokens = set(_tokens(pi.item_name or ""))
+    index = _catalog_index()
+    q_tokens = frozenset(_tokens(pi.item_name or ""))
     brand = (pi.brand or "").lower()
     color = (pi.color or "").lower()
-    phone_like = _is_phone_like(pi)
-
-    scored: List[tuple[float, Dict[str, Any]]] = []
-    for offer in offers:
-        if phone_like and _is_accessory(offer):
-            # skip cases/covers when the query is for a phone device, not an accessory
-            continue
-        score = 0.0
-        title_tokens = set(_tokens(offer.get("title") or ""))
-        if q_tokens:
-            score += len(q_tokens & title_tokens)
-        for kw in offer.get("keywords") or []:
-            score += len(q_tokens & set(_tokens(kw))) * 0.2
-        vendor = (offer.get("vendor") or "").lower()
-        if brand and brand in vendor:
-            score += 2.0
-        if color and color in (offer.get("title") or "").lower():
-            score += 0.5
-        price = offer.get("price_usd")
-        if pi.budget_usd and price and price <= pi.budget_usd:
-            score += 0.5
-        scored.append((score, offer))
-
-    scored.sort(key=lambda tup: tup[0], reverse=True)
-    top = [offer for score, offer in scored if score > 0][:top_k]
-    if not top:
-        top = [offer for _, offer in scored[:top_k]]
-    return top
+
+    # Sparse dot product of the query against the title/keyword token postings.
+    title_hits = np.zeros(len(offers), dtype=np.intp)
+    keyword_hits = np.zeros(len(offers), dtype=np.intp)
+    for tok in q_tokens:
+        postings = index.title_postings.get(tok)
+        if postings is not None:
+            title_hits[postings] += 1
+        postings = index.keyword_postings.get(tok)
+        if postings is not None:
+            np.add.at(keyword_hits, postings, 1)
+    scores = title_hits + 0.2 * keyword_hits
+    if brand:
+        scores += 2.0 * (np.char.find(index.vendor_lower, brand) >= 0)
+    if color:
+        scores += 0.5 * (np.char.find(index.title_lower, color) >= 0)
+    if pi.budget_usd:
+        with np.errstate(invalid="ignore"):
+            scores += 0.5 * ((index.prices != 0) & (index.prices <= pi.budget_usd))
+
+    candidates = np.arange(len(offers))
+    if _is_phone_like(q_tokens):
+        # skip cases/covers when the query is for a phone device, not an accessory
+        candidates = candidates[~index.accessory]
+
+    positive = candidates[scores[candidates] > 0]
+    pool = positive if len(positive) else candidates
+    return [offers[i] for i in _top_k(pool, scores[pool], top_k)]
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
-import json
 import os
+import re
 from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Tuple
+from typing import Any, Dict, Iterable, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import orjson
 
 from ..schemas.models import Offer
 
@@ -15,21 +18,120 @@ PRICE_REFS_PATH = os.getenv(
 )
 
 
+RefStats = Tuple[float, float]
+RefKey = Tuple[str, str]
+
+_METRICS = ("price", "weight", "height", "width", "length")
+_RESOLVED_MAX = 4096  # cap on memoized (brand, category) keys absent from the refs file
+
+
+class PriceRefs(NamedTuple):
+    """Reference stats keyed by (brand, category), plus fallback-resolved views.
+
+    ``resolved`` maps a lookup key to ``metric -> (median, spread)`` with the
+    brand+category / brand / category / global chain already applied per metric.
+    ``brand_pattern`` matches any brand that has refs, anywhere in a lowercased title.
+    """
+
+    entries: Dict[RefKey, Dict[str, RefStats]]
+    resolved: Dict[RefKey, Dict[str, RefStats]]
+    brand_pattern: Optional[re.Pattern[str]]
+
+
+def _parse_stats(raw: Any) -> RefStats | None:
+    if not isinstance(raw, dict):
+        return None
+    try:
+        median = float(raw.get("median", 0.0))
+        spread = float(raw.get("spread", 0.0)) or 1.0
+    except (TypeError, ValueError):
+        return None
+    return median, spread
+
+
+def _merge_chain(entries: Dict[RefKey, Dict[str, RefStats]], chain: Tuple[RefKey, ...]) -> Dict[str, RefStats]:
+    merged: Dict[str, RefStats] = {}
+    for key in reversed(chain):  # most specific level written last wins
+        merged.update(entries.get(key, {}))
+    return merged
+
+
+def _index_refs(raw: Dict[str, Any]) -> PriceRefs:
+    """Turn ``{"brand|cat": {metric: {median, spread}}}`` into tuple-keyed float pairs."""
+    entries: Dict[RefKey, Dict[str, RefStats]] = {}
+    for key, entry in raw.items():
+        if not isinstance(entry, dict):
+            continue
+        brand, _, cat = key.partition("|")
+        # Older refs files stored the price stats directly on the entry.
+        metrics = {"price": entry} if "median" in entry else entry
+        parsed = {m: stats for m in _METRICS if (stats := _parse_stats(metrics.get(m))) is not None}
+        if parsed:
+            entries[_key(brand, cat)] = parsed
+    resolved = {key: _merge_chain(entries, _fallback_chain(*key)) for key in entries}
+    return PriceRefs(entries, resolved, _brand_pattern(brand for brand, _ in entries))
+
+
+def _trie_regex(node: Dict[str, Any]) -> str:
+    """Regex for a character trie: shared prefixes appear once, longer brands are tried first."""
+    terminal = "" in node
+    branches = []
+    for ch in sorted(k for k in node if k):
+        literal, child = ch, node[ch]
+        while "" not in child and len(child) == 1:  # collapse single-child chains
+            (nxt, child), = child.items()
+            literal += nxt
+        branches.append(re.escape(literal) + _trie_regex(child))
+    if not branches:
+        return ""
+    if len(branches) > 1:
+        body, atomic = "(?:" + "|".join(branches) + ")", True
+    else:
+        body, atomic = branches[0], len(branches[0]) == 1
+    if terminal:
+        return body + "?" if atomic else "(?:" + body + ")?"
+    return body
+
+
+def _brand_pattern(brands: Iterable[str]) -> Optional[re.Pattern[str]]:
+    """All known brands compiled as one trie-shaped regex, matched on word boundaries."""
+    root: Dict[str, Any] = {}
+    for brand in brands:
+        if not brand:
+            continue
+        node = root
+        for ch in brand:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+    if not root:
+        return None
+    return re.compile(r"(?<![a-z0-9])" + _trie_regex(root) + r"(?![a-z0-9])")
+
+
 @lru_cache(maxsize=1)
-def _load_price_refs() -> Dict[str, Dict[str, float]]:
-    path = Path(PRICE_REFS_PATH)
-    if not path.exists():
-        return {}
+def _read_price_refs(path: str, mtime_ns: int | None) -> PriceRefs:
+    if mtime_ns is None:
+        return _index_refs({})
     try:
-        return json.loads(path.read_text(encoding="utf-8"))
+        return _index_refs(orjson.loads(Path(path).read_bytes()))
     except Exception:
-        return {}
+        return _index_refs({})
+
+
+def _load_price_refs() -> PriceRefs:
+    """Parsed refs, re-read whenever the file's mtime changes so rebuilds apply without a restart."""
+    try:
+        mtime_ns: int | None = os.stat(PRICE_REFS_PATH).st_mtime_ns
+    except OSError:
+        mtime_ns = None
+    return _read_price_refs(PRICE_REFS_PATH, mtime_ns)
 
 
 def _key(brand: str | None, category: str | None) -> Tuple[str, str]:
     return ((brand or "").strip().lower(), (category or "").strip().lower())
 
 
+@lru_cache(maxsize=8192)
 def _extract_brand_from_title(title: str) -> str | None:
     if not title:
         return None
@@ -37,7 +139,52 @@ def _extract_brand_from_title(title: str) -> str | None:
     tok = title.strip().split()[0].strip().strip("-_")
     if not tok:
         return None
-    return tok
+    return tok.lower()
+
+
+@lru_cache(maxsize=4096)
+def _fallback_chain(brand: str, category: str) -> Tuple[RefKey, ...]:
+    """Reference keys in fallback order: brand+category, brand, category, global."""
+    cat = category.lower()
+    return ((brand, cat), (brand, ""), ("", cat), ("", ""))
+
+
+@lru_cache(maxsize=8192)
+def _match_brand(pattern: Optional[re.Pattern[str]], title: str) -> str:
+    """First known brand anywhere in the title, else the first-token heuristic."""
+    if pattern is not None:
+        match = pattern.search(title.lower())
+        if match:
+            return match.group(0)
+    return _extract_brand_from_title(title) or ""
+
+
+def _resolve(refs: PriceRefs, offer: Offer) -> Dict[str, RefStats]:
+    chain = _fallback_chain(_match_brand(refs.brand_pattern, offer.title or ""), offer.category or "")
+    stats = refs.resolved.get(chain[0])
+    if stats is None:
+        # The chain depends only on its first key, so the merge is safe to memoize.
+        stats = _merge_chain(refs.entries, chain)
+        if len(refs.resolved) < len(refs.entries) + _RESOLVED_MAX:
+            refs.resolved[chain[0]] = stats
+    return stats
+
+
+def _robust_z(value: float, stats: RefStats) -> float:
+    median, spread = stats
+    # robust z (median-centered spread): (x - median) / spread
+    return (value - median) / spread
+
+
+def _attribute_value(offer: Offer, attr_name: str) -> float | None:
+    attrs = offer.attributes or {}
+    raw = attrs.get(attr_name)
+    if raw is None:
+        return None
+    try:
+        return float(raw)
+    except Exception:
+        return None
 
 
 def compute_price_z(offer: Offer) -> float | None:
@@ -46,78 +193,66 @@ def compute_price_z(offer: Offer) -> float | None:
     Returns negative z for cheaper-than-reference, positive for expensive listings.
     If refs are missing, returns None.
     """
-    refs = _load_price_refs()
-    if not refs:
-        return None
-    brand = _extract_brand_from_title(offer.title or "")
-    cat = offer.category or None
-    price = offer.price_usd
-    if price is None:
-        return None
-    # Try brand+category, then brand-only, then category-only, then global
-    for key in (
-        f"{(brand or '').lower()}|{(cat or '').lower()}",
-        f"{(brand or '').lower()}|",
-        f"|{(cat or '').lower()}",
-        "|",
-    ):
-        stats = refs.get(key)
-        if not stats:
-            continue
-        metric_stats = stats.get("price") or stats
-        median = float(metric_stats.get("median", 0.0))
-        spread = float(metric_stats.get("spread", 0.0)) or 1.0
-        # robust z (median-centered spread): (x - median) / spread
-        return (float(price) - median) / spread
-    return None
+    return compute_all_zscores(offer)["price"]
+
+
+def compute_weight_z(offer: Offer) -> float | None:
+    return compute_all_zscores(offer)["weight"]
+
+
+def compute_dimension_zscores(offer: Offer) -> Dict[str, float]:
+    return compute_all_zscores(offer)["dimensions"]
 
 
-def _compute_metric_z(offer: Offer, metric: str, attr_name: str) -> float | None:
+def compute_all_zscores(offer: Offer) -> Dict[str, Any]:
+    """Compute price, weight and dimension z-scores with a single reference lookup.
+
+    The single-metric helpers above select their field from this result.
+    Returns ``{"price": float|None, "weight": float|None, "dimensions": {...}}``.
+    """
+    result: Dict[str, Any] = {"price": None, "weight": None, "dimensions": {}}
     refs = _load_price_refs()
-    if not refs:
-        return None
-    brand = _extract_brand_from_title(offer.title or "")
-    cat = offer.category or None
-    value = None
-    if metric == "price":
-        value = offer.price_usd
-    else:
-        attrs = offer.attributes or {}
-        raw = attrs.get(attr_name)
-        if raw is None:
-            return None
-        try:
-            value = float(raw)
-        except Exception:
-            return None
-    if value is None:
-        return None
-    for key in (
-        f"{(brand or '').lower()}|{(cat or '').lower()}",
-        f"{(brand or '').lower()}|",
-        f"|{(cat or '').lower()}",
-        "|",
-    ):
-        stats = refs.get(key)
-        if not stats:
-            continue
+    if not refs.entries:
+        return result
+    stats = _resolve(refs, offer)
+    for metric in _METRICS:
         metric_stats = stats.get(metric)
-        if not metric_stats:
+        if metric_stats is None:
             continue
-        median = float(metric_stats.get("median", 0.0))
-        spread = float(metric_stats.get("spread", 0.0)) or 1.0
-        return (float(value) - median) / spread
-    return None
-
+        value = offer.price_usd if metric == "price" else _attribute_value(offer, metric)
+        if value is None:
+            continue
+        z = _robust_z(value, metric_stats)
+        if metric in ("price", "weight"):
+            result[metric] = z
+        else:
+            result["dimensions"][metric] = z
+    return result
 
-def compute_weight_z(offer: Offer) -> float | None:
-    return _compute_metric_z(offer, "weight", "weight")
 
+def compute_zscores_batch(offers: Sequence[Offer]) -> np.ndarray:
+    """Vectorized z-scores for many offers at once.
 
-def compute_dimension_zscores(offer: Offer) -> Dict[str, float]:
-    scores: Dict[str, float] = {}
-    for metric in ("height", "width", "length"):
-        z = _compute_metric_z(offer, metric, metric)
-        if z is not None:
-            scores[metric] = z
-    return scores
+    Returns an ``(len(offers), 5)`` float array with columns in ``_METRICS`` order
+    (price, weight, height, width, length); NaN where a value or reference is
+    missing. Each metric resolves the fallback chain exactly like
+    ``compute_all_zscores``; only the arithmetic is batched.
+    """
+    shape = (len(offers), len(_METRICS))
+    values = np.full(shape, np.nan)
+    medians = np.full(shape, np.nan)
+    spreads = np.ones(shape)
+    refs = _load_price_refs()
+    if not refs.entries:
+        return values
+    for row, offer in enumerate(offers):
+        stats = _resolve(refs, offer)
+        for col, metric in enumerate(_METRICS):
+            metric_stats = stats.get(metric)
+            if metric_stats is None:
+                continue
+            value = offer.price_usd if metric == "price" else _attribute_value(offer, metric)
+            if value is not None:
+                values[row, col] = value
+                medians[row, col], spreads[row, col] = metric_stats
+    return (values - medians) / spreads
@@ -1,7 +1,17 @@
-import asyncio, functools, random
-from typing import Callable
+import asyncio, functools, random, time
+from typing import Any, Callable, Optional
+
+import httpx
+
+_RETRYABLE_STATUS = frozenset({408, 429, 500, 502, 503, 504})
+
+# Private generator for backoff jitter; keeps retries off the shared module-level RNG.
+_rng = random.Random()
+
 
 def retry_async(max_attempts: int = 2, base_delay: float = 0.2):
+    delays = tuple(base_delay * (1 << i) for i in range(max_attempts))
+
     def deco(fn: Callable):
         @functools.wraps(fn)
         async def wrapper(*args, **kwargs):
@@ -13,7 +23,118 @@ def retry_async(max_attempts: int = 2, base_delay: float = 0.2):
                     attempt += 1
                     if attempt > max_attempts:
                         raise
-                    delay = base_delay * (2 ** (attempt-1)) + random.uniform(0, 0.05)
-                    await asyncio.sleep(delay)
+                    await asyncio.sleep(delays[attempt-1] + _rng.uniform(0, 0.05))
         return wrapper
     return deco
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a provider whose breaker is open."""
+
+
+class CircuitBreaker:
+    """Closed -> open after ``fail_max`` consecutive transient failures; after
+    ``reset_timeout_s`` one probe at a time is let through (half-open) while other
+    callers keep getting ``CircuitOpenError``, and ``success_threshold`` successful
+    probes close it again. Any half-open failure re-opens it."""
+
+    def __init__(self, name: str, fail_max: int = 5, reset_timeout_s: float = 30.0, success_threshold: int = 2):
+        self.name = name
+        self.fail_max = fail_max
+        self.reset_timeout_s = reset_timeout_s
+        self.success_threshold = success_threshold
+        self.state = "closed"
+        self._failures = 0
+        self._successes = 0
+        self._opened_at = 0.0
+        self._probing = False
+
+    def before_call(self) -> None:
+        if self.state == "open":
+            if time.monotonic() - self._opened_at < self.reset_timeout_s:
+                raise CircuitOpenError(f"circuit_open: {self.name}")
+            self.state = "half_open"
+            self._successes = 0
+        if self.state == "half_open":
+            if self._probing:
+                raise CircuitOpenError(f"circuit_half_open: {self.name}")
+            self._probing = True
+
+    def release(self) -> None:
+        """Free the half-open probe slot without counting the call as a success or failure."""
+        self._probing = False
+
+    def record_non_transient(self) -> None:
+        """The provider answered (e.g. a 4xx): end the run of consecutive failures."""
+        self._probing = False
+        self._failures = 0
+
+    def record_success(self) -> None:
+        self._probing = False
+        if self.state == "half_open":
+            self._successes += 1
+            if self._successes < self.success_threshold:
+                return
+        self.state = "closed"
+        self._failures = 0
+
+    def record_failure(self) -> None:
+        self._probing = False
+        self._failures += 1
+        if self.state == "half_open" or self._failures >= self.fail_max:
+            self.state = "open"
+            self._opened_at = time.monotonic()
+
+
+def is_transient(exc: BaseException) -> bool:
+    """Timeouts, transport errors and 408/429/5xx responses are worth retrying."""
+    if isinstance(exc, (TimeoutError, httpx.TransportError)):
+        return True
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code in _RETRYABLE_STATUS
+    return False
+
+
+async def call_with_retry(
+    fn: Callable,
+    *args: Any,
+    retries: int,
+    breaker: Optional[CircuitBreaker] = None,
+    base_delay: float = 0.1,
+    max_delay: float = 2.0,
+    jitter: float = 0.2,
+    deadline_s: Optional[float] = None,
+    **kwargs: Any,
+):
+    """Await ``fn(*args, **kwargs)``, retrying transient errors up to ``retries`` times
+    with capped exponential backoff and +/-``jitter`` proportional noise.
+
+    ``deadline_s`` caps the whole call, attempts and sleeps together; past it
+    the pending attempt is cancelled and ``TimeoutError`` is raised."""
+    async with asyncio.timeout(deadline_s):
+        attempt = 0
+        while True:
+            if breaker is not None:
+                breaker.before_call()
+            try:
+                out = await fn(*args, **kwargs)
+            except Exception as exc:
+                transient = is_transient(exc)
+                if breaker is not None:
+                    if transient:
+                        breaker.record_failure()
+                    else:
+                        breaker.record_non_transient()
+                if not transient or attempt >= retries:
+                    raise
+                delay = min(max_delay, base_delay * (2 ** attempt)) * (1 + _rng.uniform(-jitter, jitter))
+                attempt += 1
+                await asyncio.sleep(delay)
+                continue
+            except BaseException:  # cancelled mid-probe: don't leave the half-open slot taken
+                if breaker is not None:
+                    breaker.release()
+                raise
+            if breaker is not None:
+                breaker.record_success()
+            return out
@@ -131,3 +131,25 @@ async def test_intake_fallback(sample_image):
 
     assert hypo.label in {"bottle", "object"}
     assert hypo.brand in {None, "Nike"}
+
+
+@pytest.mark.asyncio
+async def test_intake_image_bytes_without_file(sample_image):
+    response = _StubResponse(
+        objects=[_StubObject("bottle", 0.88)],
+        colors=[_StubColor(10, 200, 20, 0.9)],
+    )
+    vision._set_client_for_tests(_StubClient(response))
+
+    hypo = await vision.intake_image_bytes(sample_image.read_bytes(), "upload.jpg")
+
+    assert hypo.label == "bottle"
+    assert isinstance(hypo.bbox, BBox)
+
+
+def test_fallback_from_filename_matches_brand_and_label():
+    hypo = vision._fallback_from_filename("/uploads/Nike_water_bottle.jpg")
+    assert (hypo.label, hypo.brand) == ("bottle", "Nike")
+
+    brand_only = vision._fallback_from_filename("adidas_promo.jpg")
+    assert (brand_only.label, brand_only.brand) == ("sneaker", "Adidas")
@@ -1,9 +1,14 @@
 ﻿from __future__ import annotations
 
+import json
+from collections import OrderedDict
+
 import pytest
 
 from ..apps.agent3_sourcing.main import offers_for_intent, _load_catalog
-from ..libs.schemas.models import PurchaseIntent
+from ..libs.agents import sourcing_chain
+from ..libs.providers import abo_catalog
+from ..libs.schemas.models import Offer, PurchaseIntent
 
 
 @pytest.mark.asyncio
@@ -37,3 +42,59 @@ async def test_tags_and_description():
     offer = (await offers_for_intent(pi, top_k=1))[0]
     assert offer.description
     assert offer.tags
+
+
+@pytest.fixture
+def abo_offers(tmp_path, monkeypatch):
+    rows = [
+        {"vendor": "Apple", "title": "Apple iPhone 15 Pro Black", "price_usd": 999.0, "keywords": ["phone"]},
+        {"vendor": "Spigen", "title": "iPhone 15 Pro Case Black", "price_usd": 19.0, "keywords": ["case"]},
+        {"vendor": "Samsung", "title": "Galaxy S24", "price_usd": 799.0, "keywords": ["phone", "android phone"]},
+        {"vendor": "Hydro", "title": "Water Bottle", "price_usd": 0, "keywords": []},
+    ]
+    path = tmp_path / "abo_offers.jsonl"
+    path.write_text("\n".join(json.dumps(row) for row in rows) + "\n\n", encoding="utf-8")
+    monkeypatch.setattr(abo_catalog, "ABO_OFFERS_PATH", str(path))
+    abo_catalog._load_offers.cache_clear()
+    abo_catalog._catalog_index.cache_clear()
+    yield rows
+    abo_catalog._load_offers.cache_clear()
+    abo_catalog._catalog_index.cache_clear()
+
+
+def test_abo_search_ranks_brand_and_skips_accessories(abo_offers):
+    pi = PurchaseIntent(item_name="iphone 15 pro", brand="apple", color="black", category="electronics")
+    titles = [offer["title"] for offer in abo_catalog.search_abo_offers(pi, top_k=3)]
+    assert titles[0] == "Apple iPhone 15 Pro Black"
+    assert "iPhone 15 Pro Case Black" not in titles
+
+
+def test_abo_search_keyword_and_budget_scores(abo_offers):
+    pi = PurchaseIntent(item_name="phone case", category="electronics", budget_usd=50.0)
+    titles = [offer["title"] for offer in abo_catalog.search_abo_offers(pi, top_k=2)]
+    assert titles == ["iPhone 15 Pro Case Black", "Galaxy S24"]
+
+
+@pytest.mark.asyncio
+async def test_llm_rerank_is_memoized(monkeypatch):
+    calls = []
+
+    class _FakeChain:
+        async def ainvoke(self, payload, config=None):
+            calls.append(payload)
+            return sourcing_chain.OfferRanking(ranked_indices=[1, 0])
+
+    monkeypatch.setattr(sourcing_chain, "_llm", lambda: object())
+    monkeypatch.setattr(sourcing_chain, "_chain", lambda: _FakeChain())
+    monkeypatch.setattr(sourcing_chain, "_RANK_CACHE", OrderedDict())
+    pi = PurchaseIntent(item_name="mug")
+    offers = [
+        Offer(vendor=v, title="Mug", price_usd=10.0, shipping_days=2, eta_days=3, url=f"https://{v}.example/mug")
+        for v in ("a", "b")
+    ]
+    first = await sourcing_chain.rerank_offers_with_llm(pi, offers)
+    second = await sourcing_chain.rerank_offers_with_llm(pi, offers)
+    assert [o.vendor for o in first] == [o.vendor for o in second] == ["b", "a"]
+    assert len(calls) == 1
+    await sourcing_chain.rerank_offers_with_llm(pi, offers[::-1])
+    assert len(calls) == 2
@@ -3,6 +3,7 @@
 import pytest
 
 from ..apps.agent4_trust.main import assess
+from ..libs.providers import price_refs
 from ..libs.schemas.models import Offer
 
 
@@ -48,3 +49,21 @@ async def test_unknown_vendor_high_risk():
 async def test_suspicious_url_high_risk():
     trust = await assess(_offer("Mockazon", url="http://mock.local/scam-deal"))
     assert trust.risk == "high"
+
+
+_REFS = {
+    "sample|test": {"price": {"median": 20.0, "spread": 5.0}},
+    "|test": {"weight": {"median": 1.0, "spread": 0.5}, "height": {"median": 10.0, "spread": 2.0}},
+}
+
+
+@pytest.mark.asyncio
+async def test_weight_outlier_raises_risk(monkeypatch):
+    monkeypatch.setattr(price_refs, "_load_price_refs", lambda: price_refs._index_refs(_REFS))
+    offer = _offer("Mockazon", price=20.0)
+    offer.attributes = {"weight": 3.0}
+
+    trust = await assess(offer)
+
+    assert trust.weight_zscore == 4.0
+    assert trust.risk == "high"
@@ -0,0 +1,78 @@
+import asyncio
+import json
+import threading
+
+import pytest
+
+from ...apps.coordinator import metrics as metrics_mod
+from ...apps.coordinator.metrics import Metrics
+
+
+@pytest.fixture
+def metrics(tmp_path):
+    m = Metrics()
+    m._eval_log = tmp_path / "eval.log"
+    return m
+
+
+def _logged(m: Metrics) -> list[dict]:
+    return [json.loads(line) for line in m._eval_log.read_text(encoding="utf-8").splitlines()]
+
+
+@pytest.mark.asyncio
+async def test_event_writer_flushes_queued_events_on_exit(metrics):
+    async with metrics.event_writer():
+        async with metrics.event_writer():  # nested use shares the running writer
+            for i in range(3):
+                metrics.log_event_async({"event": "S1_CAPTURE", "i": i})
+        assert metrics._event_queue is not None
+        metrics.log_event_async({"event": "SAGA_COMPLETE"})
+    assert metrics._event_queue is None
+    assert [e.get("i") for e in _logged(metrics)] == [0, 1, 2, None]
+    assert metrics.evaluation_summary()["events_logged"] == 4
+
+
+@pytest.mark.asyncio
+async def test_event_writer_counts_drops_when_queue_full(metrics, monkeypatch):
+    monkeypatch.setattr(metrics_mod, "_EVENT_QUEUE_MAX", 2)
+    async with metrics.event_writer():
+        # No await in between: the worker cannot drain, so the third event overflows.
+        for i in range(3):
+            metrics.log_event_async({"event": "S3_SOURCING", "i": i})
+    assert [e["i"] for e in _logged(metrics)] == [0, 1]
+    summary = metrics.evaluation_summary()
+    assert summary["events_logged"] == 2
+    assert summary["events_dropped"] == 1
+
+
+@pytest.mark.asyncio
+async def test_event_writer_stops_worker_when_cancelled_mid_flush(metrics, monkeypatch):
+    release = threading.Event()
+    write = metrics._write_events
+
+    def slow_write(batch):
+        release.wait(5)
+        write(batch)
+
+    monkeypatch.setattr(metrics, "_write_events", slow_write)
+
+    workers = []
+
+    async def saga():
+        async with metrics.event_writer():
+            workers.append(metrics._event_worker)
+            metrics.log_event_async({"event": "S1_CAPTURE"})
+
+    task = asyncio.create_task(saga())
+    await asyncio.sleep(0.05)  # the worker is now blocked writing, the saga in join()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    release.set()
+    assert workers[0].done()
+    assert metrics._event_queue is None and metrics._event_worker is None
+
+
+def test_log_event_async_writes_directly_without_writer(metrics):
+    metrics.log_event_async({"event": "S2_CONFIRM"})
+    assert _logged(metrics) == [{"event": "S2_CONFIRM"}]
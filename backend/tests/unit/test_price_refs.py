@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from ...libs.providers import price_refs
+from ...libs.schemas.models import Offer
+
+_REFS = {
+    "sample|test": {"price": {"median": 20.0, "spread": 5.0}},
+    "|test": {"weight": {"median": 1.0, "spread": 0.5}, "height": {"median": 10.0, "spread": 2.0}},
+}
+
+
+@pytest.fixture(autouse=True)
+def refs(monkeypatch):
+    monkeypatch.setattr(price_refs, "_load_price_refs", lambda: price_refs._index_refs(_REFS))
+
+
+def _offer(title: str = "Sample", price: float = 10.0, category: str = "test") -> Offer:
+    return Offer(
+        vendor="Mockazon",
+        title=title,
+        price_usd=price,
+        shipping_days=3,
+        eta_days=5,
+        url="http://127.0.0.1/mock/item",
+        category=category,
+    )
+
+
+def test_compute_all_zscores_matches_individual_helpers():
+    offer = _offer()
+    offer.attributes = {"weight": "3.0", "height": 10.0, "width": 4.0}
+
+    zscores = price_refs.compute_all_zscores(offer)
+
+    assert zscores["price"] == price_refs.compute_price_z(offer) == -2.0
+    assert zscores["weight"] == price_refs.compute_weight_z(offer) == 4.0
+    assert zscores["dimensions"] == price_refs.compute_dimension_zscores(offer) == {"height": 0.0}
+
+
+def test_brand_found_mid_title():
+    assert price_refs.compute_price_z(_offer(title="Insulated Sample tumbler")) == -2.0
+
+
+def test_compute_zscores_batch_matches_per_offer():
+    measured = _offer()
+    measured.attributes = {"weight": "3.0", "height": 10.0, "width": 4.0}
+    unknown = _offer(price=20.0, category="other")
+
+    batch = price_refs.compute_zscores_batch([measured, unknown])
+
+    single = price_refs.compute_all_zscores(measured)
+    assert batch.shape == (2, 5)
+    assert batch[0, 0] == single["price"]
+    assert batch[0, 1] == single["weight"]
+    assert batch[0, 2] == single["dimensions"]["height"]
+    assert np.isnan(batch[0, 3:]).all()
+    assert np.isnan(batch[1]).all()
@@ -0,0 +1,154 @@
+import asyncio
+
+import httpx
+import pytest
+
+from ...libs.utils.retry import CircuitBreaker, CircuitOpenError, call_with_retry, is_transient
+
+
+def _status_error(code: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("POST", "http://agent/x")
+    return httpx.HTTPStatusError("err", request=request, response=httpx.Response(code, request=request))
+
+
+def test_is_transient():
+    assert is_transient(TimeoutError())
+    assert is_transient(httpx.ConnectError("down"))
+    assert is_transient(_status_error(503))
+    assert not is_transient(_status_error(400))
+    assert not is_transient(ValueError("bad"))
+
+
+@pytest.mark.asyncio
+async def test_retries_transient_then_succeeds():
+    calls = []
+
+    async def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise TimeoutError()
+        return "ok"
+
+    assert await call_with_retry(flaky, retries=2, base_delay=0) == "ok"
+    assert len(calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_does_not_retry_client_errors():
+    calls = []
+
+    async def rejected():
+        calls.append(1)
+        raise _status_error(400)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await call_with_retry(rejected, retries=3, base_delay=0)
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_breaker_opens_then_recovers(monkeypatch):
+    breaker = CircuitBreaker("S3", fail_max=2, reset_timeout_s=30.0, success_threshold=2)
+    now = [100.0]
+    monkeypatch.setattr("time.monotonic", lambda: now[0])
+
+    async def down():
+        raise httpx.ConnectError("down")
+
+    async def up():
+        return "ok"
+
+    with pytest.raises(httpx.ConnectError):
+        await call_with_retry(down, retries=1, base_delay=0, breaker=breaker)
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        await call_with_retry(up, retries=1, base_delay=0, breaker=breaker)
+
+    now[0] += 31.0
+    assert await call_with_retry(up, retries=0, breaker=breaker) == "ok"
+    assert breaker.state == "half_open"
+    assert await call_with_retry(up, retries=0, breaker=breaker) == "ok"
+    assert breaker.state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_half_open_lets_one_probe_through(monkeypatch):
+    breaker = CircuitBreaker("S4", fail_max=1, reset_timeout_s=30.0, success_threshold=1)
+    now = [100.0]
+    monkeypatch.setattr("time.monotonic", lambda: now[0])
+    breaker.record_failure()
+    now[0] += 31.0
+
+    gate = asyncio.Event()
+
+    async def slow_probe():
+        await gate.wait()
+        return "ok"
+
+    async def up():
+        return "ok"
+
+    probe = asyncio.create_task(call_with_retry(slow_probe, retries=0, breaker=breaker))
+    await asyncio.sleep(0)
+    assert breaker.state == "half_open"
+    with pytest.raises(CircuitOpenError):
+        await call_with_retry(up, retries=0, breaker=breaker)
+
+    gate.set()
+    assert await probe == "ok"
+    assert breaker.state == "closed"
+    assert await call_with_retry(up, retries=0, breaker=breaker) == "ok"
+
+
+@pytest.mark.asyncio
+async def test_half_open_probe_released_on_client_error(monkeypatch):
+    breaker = CircuitBreaker("S4", fail_max=1, reset_timeout_s=30.0, success_threshold=1)
+    now = [100.0]
+    monkeypatch.setattr("time.monotonic", lambda: now[0])
+    breaker.record_failure()
+    now[0] += 31.0
+
+    async def rejected():
+        raise _status_error(400)
+
+    async def up():
+        return "ok"
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await call_with_retry(rejected, retries=0, breaker=breaker)
+    assert breaker.state == "half_open"
+    assert await call_with_retry(up, retries=0, breaker=breaker) == "ok"
+    assert breaker.state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_client_error_resets_consecutive_failures():
+    breaker = CircuitBreaker("S3", fail_max=2)
+
+    async def down():
+        raise httpx.ConnectError("down")
+
+    async def rejected():
+        raise _status_error(400)
+
+    for fn in (down, rejected, down):
+        with pytest.raises(httpx.HTTPError):
+            await call_with_retry(fn, retries=0, breaker=breaker)
+    assert breaker.state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_deadline_caps_all_attempts():
+    breaker = CircuitBreaker("S3", fail_max=10)
+    calls = []
+
+    async def slow():
+        calls.append(1)
+        await asyncio.sleep(0.04)
+        raise TimeoutError()
+
+    with pytest.raises(TimeoutError):
+        await call_with_retry(slow, retries=5, base_delay=0, breaker=breaker, deadline_s=0.1)
+    assert 1 < len(calls) < 6  # retries left unused when the budget ran out
+    # The attempt cut off by the deadline freed its slot without counting as a failure.
+    assert breaker._failures == len(calls) - 1 and not breaker._probing
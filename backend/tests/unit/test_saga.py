@@ -0,0 +1,149 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from ...apps.coordinator import saga
+from ...apps.coordinator.config import TIMEOUTS
+from ...apps.coordinator.metrics import METRICS
+from ...libs.schemas.models import Offer, ProductHypothesis, PurchaseIntent, TrustAssessment
+from ...libs.utils.retry import CircuitBreaker
+
+GUESS = PurchaseIntent(item_name="mug", color="black")
+
+
+def _offer(vendor: str, score: float) -> Offer:
+    return Offer(
+        vendor=vendor, title=f"{vendor} mug", price_usd=12.0, shipping_days=2, eta_days=3,
+        url=f"https://{vendor}.example", score=score,
+    )
+
+
+class FakeAgents:
+    """Stand-ins for the agent clients that record every call and can be tuned per test."""
+
+    def __init__(self):
+        self.intent = GUESS
+        self.intent_error = None
+        self.intent_delay = 0.0
+        self.sourcing_delay = 0.0
+        self.offers = [_offer("a", 0.9), _offer("b", 0.85), _offer("c", 0.4)]
+        self.risk = {}
+        self.sourced = []
+        self.trusted = []
+        self.cancelled = []
+        self.hang = asyncio.Event()  # never set: "slow" calls wait until cancelled
+
+    async def vision(self, image, headers=None):
+        return ProductHypothesis(label="mug", brand="acme", confidence=0.9)
+
+    async def confirm(self, hypo, *, user_text=None, headers=None):
+        await asyncio.sleep(self.intent_delay)
+        if self.intent_error is not None:
+            raise self.intent_error
+        return self.intent
+
+    async def sourcing(self, intent, headers=None):
+        self.sourced.append(intent)
+        try:
+            if intent != self.intent:
+                await self.hang.wait()
+            await asyncio.sleep(self.sourcing_delay)
+        except asyncio.CancelledError:
+            self.cancelled.append(("sourcing", intent))
+            raise
+        return list(self.offers)
+
+    async def trust(self, offer, headers=None):
+        self.trusted.append(offer.vendor)
+        return TrustAssessment(
+            vendor=offer.vendor, tls=True, domain_age_days=400, has_policy_pages=True,
+            risk=self.risk.get(offer.vendor, "low"),
+        )
+
+
+@pytest.fixture
+def agents(monkeypatch, tmp_path):
+    fake = FakeAgents()
+    monkeypatch.setattr(saga, "call_vision", fake.vision)
+    monkeypatch.setattr(saga, "call_intent_confirm", fake.confirm)
+    monkeypatch.setattr(saga, "call_sourcing", fake.sourcing)
+    monkeypatch.setattr(saga, "call_trust", fake.trust)
+    monkeypatch.setattr(saga, "_fast_intent_guess", lambda hypo, user_text: GUESS)
+    monkeypatch.setattr(saga, "_BREAKERS", {state: CircuitBreaker(state) for state in TIMEOUTS})
+    monkeypatch.setattr(METRICS, "_eval_log", tmp_path / "eval.log")
+    return fake
+
+
+def _pending_tasks() -> list:
+    return [t for t in asyncio.all_tasks() if t is not asyncio.current_task() and not t.done()]
+
+
+def _dt(out: dict, state: str) -> float:
+    return next(e["dt_s"] for e in out["log"] if e["state"] == state)
+
+
+async def test_speculative_hit_reuses_sourcing(agents):
+    agents.intent_delay = 0.05
+    agents.sourcing_delay = 0.04
+    out = await saga.run_saga("mug.jpg", None, None, auto_checkout=False)
+    assert agents.sourced == [GUESS]
+    # S3 is timed by its own call, not by what was left of it after S2.
+    assert _dt(out, "S3_SOURCING") >= 0.035
+    assert out["offer"].vendor == "a"
+
+
+async def test_speculative_miss_cancels_and_resources(agents):
+    agents.intent = PurchaseIntent(item_name="mug", color="red")
+    out = await saga.run_saga("mug.jpg", None, None, auto_checkout=False)
+    assert agents.sourced == [GUESS, agents.intent]
+    assert agents.cancelled == [("sourcing", GUESS)]
+    assert out["intent"] == agents.intent
+    assert not _pending_tasks()
+
+
+async def test_s2_failure_cancels_speculation(agents):
+    agents.intent = PurchaseIntent(item_name="mug", color="red")  # speculation hangs
+    agents.intent_error = ValueError("bad hypothesis")
+    with pytest.raises(HTTPException) as exc:
+        await saga.run_saga("mug.jpg", None, None, auto_checkout=False)
+    assert exc.value.status_code == 504
+    assert agents.cancelled == [("sourcing", GUESS)]
+    assert not _pending_tasks()
+
+
+async def test_prefetched_runner_up_used_on_medium_risk(agents):
+    agents.risk = {"a": "medium"}
+    out = await saga.run_saga("mug.jpg", None, None, auto_checkout=False)
+    assert agents.trusted == ["a", "b"]  # runner-up checked once, alongside the pick
+    assert out["offer"].vendor == "b"
+    assert [o.vendor for o in out["offers"]] == ["b", "a", "c"]
+
+
+async def test_prefetch_skipped_on_large_score_gap(agents):
+    agents.offers = [_offer("a", 0.9), _offer("b", 0.3)]
+    out = await saga.run_saga("mug.jpg", None, None, auto_checkout=False)
+    assert agents.trusted == ["a"]
+    assert out["offer"].vendor == "a"
+
+
+async def test_preferred_offer_is_not_its_own_runner_up(agents):
+    agents.risk = {"b": "medium"}
+    out = await saga.run_saga(
+        "mug.jpg", None, None, preferred_offer_url="https://b.example", auto_checkout=False
+    )
+    assert agents.trusted == ["b", "a"]
+    assert out["offer"].vendor == "a"
+
+
+async def test_cancelling_run_saga_leaves_no_pending_tasks(agents):
+    agents.intent_delay = 10.0
+    agents.intent = PurchaseIntent(item_name="mug", color="red")  # speculation hangs too
+    task = asyncio.create_task(saga.run_saga("mug.jpg", None, None, auto_checkout=False))
+    await asyncio.sleep(0.05)
+    assert agents.sourced == [GUESS]
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert agents.cancelled == [("sourcing", GUESS)]
+    assert not _pending_tasks()
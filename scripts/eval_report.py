@@ -7,18 +7,41 @@ new evaluation harness logs produced by scripts/run_eval.py (RUN_*).
 from __future__ import annotations
 
 import argparse
+import csv
+import hashlib
 import json
+import os
+import pickle
 import sys
-from collections import defaultdict
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from math import log2
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 import statistics
 
+try:
+    import orjson  # optional; faster JSONL parsing
+    _loads = orjson.loads
+except Exception:  # pragma: no cover - optional dependency
+    _loads = json.loads
+
 try:
     import pandas as pd  # optional; fall back to csv only if missing
 except Exception:  # pragma: no cover - optional dependency
     pd = None
 
+try:
+    import numpy as np  # optional; vectorized bootstrap
+except Exception:  # pragma: no cover - optional dependency
+    np = None
+
+try:
+    from numba import njit, prange  # optional; JIT bootstrap kernel
+except Exception:  # pragma: no cover - optional dependency
+    njit = None
+
 
 TOKEN_PRICING_PER_KTOK = {
     # USD per 1K tokens (adjust to match your provider pricing)
@@ -36,106 +59,124 @@ def parse_args() -> argparse.Namespace:
     ap.add_argument("--tokens", default="backend/logs/token_summary.csv", help="Token CSV output")
     ap.add_argument("--compare", nargs=2, metavar=("LOG_A","LOG_B"), help="Optional: compare two logs (e.g., deterministic vs llm)")
     ap.add_argument("--bootstrap", type=int, default=0, help="Optional: bootstrap iterations for CI (printed to stdout)")
+    ap.add_argument("--cache-dir", help="Optional: pickle parsed summaries here and reuse them on later runs (no cache by default)")
+    ap.add_argument("--quiet", action="store_true", help="Skip the informational per-table prints (CSVs and aggregates still written)")
     return ap.parse_args()
 
 
-def load_events(path: Path):
-    events = []
+_READ_BUFFER = 1 << 20  # 1 MiB reads for multi-MB JSONL logs
+
+
+def load_events(path: Path) -> Iterator[dict]:
+    """Yield log events one line at a time; malformed lines are skipped."""
     if not path.exists():
         print(f"[warn] log not found: {path}")
-        return events
-    with path.open("r", encoding="utf-8") as fh:
-        for line in fh:
+        return
+    with path.open("rb", buffering=_READ_BUFFER) as fh:
+        while True:
+            lines = fh.readlines(_READ_BUFFER)
+            if not lines:
+                return
+            # Decode errors are rare: parse the whole chunk under one try and
+            # only redo it line by line when something in it is malformed.
             try:
-                events.append(json.loads(line))
-            except json.JSONDecodeError:
-                continue
-    return events
-
-
-def _expand_run_results(events: list[dict]):
-    """Extract per-run metrics and per-stage latency rows from RUN_RESULT lines.
-
-    Returns (run_rows, stage_rows).
-    """
-    run_rows = []
-    stage_rows = []
-    for ev in events:
-        if ev.get("type") != "RUN_RESULT":
-            continue
-        run_id = ev.get("run_id")
-        metrics = ev.get("metrics", {})
-        run_rows.append(
-            {
-                "run_id": run_id,
-                "image": ev.get("image"),
-                "mode": ev.get("mode"),
-                "endpoint": ev.get("endpoint"),
-                "base": ev.get("base"),
-                **{k: v for k, v in metrics.items()},
-            }
-        )
-        # Expand stage latencies
-        for st in (ev.get("events") or []):
-            stage = st.get("stage") or st.get("state")
-            dt = st.get("dt_s")
-            if stage and isinstance(dt, (int, float)):
-                stage_rows.append(
-                    {
-                        "run_id": run_id,
-                        "stage": stage,
-                        "dt_s": float(dt),
-                    }
-                )
-    return run_rows, stage_rows
-
-
-def summarize(events: list[dict]):
-    """Split events into (run_rows, stage_rows, token_rows).
+                events = list(map(_loads, lines))
+            except ValueError:  # json.JSONDecodeError / orjson.JSONDecodeError
+                events = []
+                for line in lines:
+                    try:
+                        events.append(_loads(line))
+                    except ValueError:
+                        continue
+            yield from events
+
+
+def _expand_run_result(ev: dict, run_rows: list[dict], stage_rows: list[dict]) -> None:
+    """Append the per-run metrics row and per-stage latency rows of one RUN_RESULT line."""
+    run_id = ev.get("run_id")
+    metrics = ev.get("metrics", {})
+    run_rows.append(
+        {
+            "run_id": run_id,
+            "image": ev.get("image"),
+            "mode": ev.get("mode"),
+            "endpoint": ev.get("endpoint"),
+            "base": ev.get("base"),
+            **{k: v for k, v in metrics.items()},
+        }
+    )
+    # Expand stage latencies
+    for st in (ev.get("events") or []):
+        stage = st.get("stage") or st.get("state")
+        dt = st.get("dt_s")
+        if stage and isinstance(dt, (int, float)):
+            stage_rows.append(
+                {
+                    "run_id": run_id,
+                    "stage": stage,
+                    "dt_s": float(dt),
+                }
+            )
+
+
+def summarize(events: Iterable[dict]):
+    """Split events into (run_rows, stage_rows, token_rows, rank_rows) in a single pass.
 
     - RUN_RESULT entries come from scripts/run_eval.py and contain full context.
     - TOKEN entries come from TokenBudgeter (optional if LLM used).
     - Legacy event lines may use 'event' instead of 'type'; these are ignored
       here but can be inspected manually if present.
     """
-    token_rows = [ev for ev in events if ev.get("type") == "TOKEN"]
-    run_rows, stage_rows = _expand_run_results(events)
-    return run_rows, stage_rows, token_rows
+    run_rows: list[dict] = []
+    stage_rows: list[dict] = []
+    token_rows: list[dict] = []
+    rank_runs: list[dict] = []
+    rank_rels: list[list[int]] = []
+    for ev in events:
+        kind = ev.get("type")
+        if kind == "TOKEN":
+            token_rows.append(ev)
+        elif kind == "RUN_RESULT":
+            _expand_run_result(ev, run_rows, stage_rows)
+            rank_runs.append(_rank_key(ev))
+            rank_rels.append(_run_rels(ev))
+    return run_rows, stage_rows, token_rows, _rank_rows(rank_runs, rank_rels)
 
 
+@lru_cache(maxsize=8192)
 def _norm(s: str | None) -> str:
     return (s or "").strip().lower()
 
 
-def _relevance_for_offer(offer: dict, expect: dict) -> int:
+def _relevance_for_offer(offer: dict, exp_brand: str, exp_family: str) -> int:
     """
-    Derive a graded relevance from dataset expectations and an offer.
+    Derive a graded relevance from normalized dataset expectations and an offer.
     2 = brand + family match; 1 = brand-only; 0 = otherwise.
     """
-    brand = _norm(offer.get("vendor") or offer.get("brand"))
-    title = _norm(offer.get("title"))
-    exp_brand = _norm(expect.get("brand"))
-    exp_family = _norm(expect.get("family"))
-    if not exp_brand:
-        return 0
-    if brand != exp_brand:
+    if _norm(offer.get("vendor") or offer.get("brand")) != exp_brand:
         return 0
-    if exp_family and exp_family and (exp_family in title):
+    if exp_family and exp_family in _norm(offer.get("title")):
         return 2
     return 1
 
 
+_LOG2_RANK = tuple(log2(i + 1) for i in range(1, 65))  # DCG discount denominators, rank 1..64
+
+
 def _dcg(gains: list[int], k: int) -> float:
-    from math import log2
     s = 0.0
-    for i, g in enumerate(gains[:k], start=1):
-        s += (2**g - 1) / log2(i + 1)
+    for i, g in enumerate(gains[:k]):
+        s += ((1 << g) - 1) / (_LOG2_RANK[i] if i < 64 else log2(i + 2))
     return s
 
 
 def _ndcg_at_k(rels: list[int], k: int) -> float:
     gains = [int(r) for r in rels]
     dcg = _dcg(gains, k)
+    top = gains[:k]
+    # Already ideally ordered (top-k descending and nothing better below it): idcg == dcg.
+    if all(a >= b for a, b in zip(top, top[1:])) and (len(gains) <= k or max(gains[k:]) <= top[-1]):
+        return 1.0 if dcg > 0 else 0.0
     ideal = sorted(gains, reverse=True)
     idcg = _dcg(ideal, k)
     return (dcg / idcg) if idcg > 0 else 0.0
@@ -148,56 +189,144 @@ def _mrr(rels: list[int]) -> float:
     return 0.0
 
 
-def _compute_rank_metrics(run_events: list[dict]) -> list[dict]:
-    rows = []
+def _rank_metrics_np(rels: list[list[int]], k: int) -> tuple[list[float], list[float]]:
+    """NDCG@k and MRR for every run at once over a zero-padded relevance matrix."""
+    mat = np.zeros((len(rels), max(k, max(map(len, rels)))), dtype=np.int64)
+    for i, row in enumerate(rels):
+        mat[i, :len(row)] = row
+    gains = np.left_shift(1, mat) - 1
+    denom = np.asarray(_LOG2_RANK[:k])
+    dcg = (gains[:, :k] / denom).sum(axis=1)
+    idcg = (-np.sort(-gains, axis=1)[:, :k] / denom).sum(axis=1)
+    ndcg = np.divide(dcg, idcg, out=np.zeros_like(dcg), where=idcg > 0)
+    hit = mat > 0
+    mrr = np.where(hit.any(axis=1), 1.0 / (hit.argmax(axis=1) + 1), 0.0)
+    return ndcg.tolist(), mrr.tolist()
+
+
+def _rank_key(ev: dict) -> dict:
+    return {"run_id": ev.get("run_id"), "image": ev.get("image"), "label": ev.get("label")}
+
+
+def _run_rels(ev: dict) -> list[int]:
+    offers = ev.get("offers") or []
+    expect = ev.get("expect") or {}
+    # Expectations are constant per run: normalize once, and skip offers entirely without a brand.
+    exp_brand = _norm(expect.get("brand"))
+    if not exp_brand:
+        return [0] * len(offers)
+    exp_family = _norm(expect.get("family"))
+    return [_relevance_for_offer(o, exp_brand, exp_family) for o in offers]
+
+
+def _rank_rows(runs: list[dict], rels: list[list[int]]) -> list[dict]:
+    if np is not None and runs:
+        ndcg3, mrr = _rank_metrics_np(rels, 3)
+    else:
+        ndcg3 = [_ndcg_at_k(r, 3) for r in rels]
+        mrr = [_mrr(r) for r in rels]
+    return [{**run, "ndcg3": n, "mrr": m} for run, n, m in zip(runs, ndcg3, mrr)]
+
+
+def _compute_rank_metrics(run_events: Iterable[dict]) -> list[dict]:
+    runs: list[dict] = []
+    rels: list[list[int]] = []
     for ev in run_events:
-        if ev.get("type") != "RUN_RESULT":
-            continue
-        offers = ev.get("offers") or []
-        expect = ev.get("expect") or {}
-        rels = [_relevance_for_offer(o, expect) for o in offers]
-        ndcg3 = _ndcg_at_k(rels, 3)
-        mrr = _mrr(rels)
-        rows.append({
-            "run_id": ev.get("run_id"),
-            "image": ev.get("image"),
-            "label": ev.get("label"),
-            "ndcg3": ndcg3,
-            "mrr": mrr,
-        })
-    return rows
+        if ev.get("type") == "RUN_RESULT":
+            runs.append(_rank_key(ev))
+            rels.append(_run_rels(ev))
+    return _rank_rows(runs, rels)
+
+
+_BOOTSTRAP_BLOCK = 1 << 20  # index draws per block; bounds peak memory at ~16 MB
+
+
+if njit is not None:  # pragma: no cover - requires numba
+    @njit(parallel=True, cache=True)
+    def _boot_means_nb(v, iters):
+        n = v.shape[0]
+        out = np.empty(iters)
+        for i in prange(iters):
+            s = 0.0
+            for _ in range(n):
+                s += v[np.random.randint(0, n)]
+            out[i] = s / n
+        return out
+else:
+    _boot_means_nb = None
 
 
 def _bootstrap_ci(values: list[float], iters: int = 1000, alpha: float = 0.05):
     if not values:
         return None
-    import random
     n = len(values)
-    samples = []
-    for _ in range(max(1, iters)):
-        draw = [values[random.randrange(0, n)] for _ in range(n)]
-        samples.append(sum(draw) / len(draw))
-    samples.sort()
-    lo_idx = int((alpha/2) * len(samples))
-    hi_idx = max(0, int((1 - alpha/2) * len(samples)) - 1)
-    return samples[lo_idx], samples[hi_idx]
-
-
-def write_csv(rows: list[dict], out_path: Path):
+    iters = max(1, iters)
+    lo_idx = int((alpha/2) * iters)
+    hi_idx = max(0, int((1 - alpha/2) * iters) - 1)
+    if np is None:
+        import random
+        samples = []
+        for _ in range(iters):
+            draw = [values[random.randrange(0, n)] for _ in range(n)]
+            samples.append(sum(draw) / len(draw))
+        samples.sort()
+        return samples[lo_idx], samples[hi_idx]
+    # With numba, one JIT kernel draws every resample mean in parallel; otherwise
+    # resample in (rows, n) index blocks capped at _BOOTSTRAP_BLOCK draws and take
+    # row means. Either way, select the two percentile ranks instead of sorting.
+    v = np.asarray(values, dtype=np.float64)
+    if _boot_means_nb is not None:
+        samples = _boot_means_nb(v, iters)
+    else:
+        rng = np.random.default_rng()
+        samples = np.empty(iters)
+        rows = max(1, _BOOTSTRAP_BLOCK // n)
+        for start in range(0, iters, rows):
+            stop = min(iters, start + rows)
+            samples[start:stop] = v[rng.integers(0, n, size=(stop - start, n))].mean(axis=1)
+    samples.partition(sorted({lo_idx, hi_idx}))
+    return float(samples[lo_idx]), float(samples[hi_idx])
+
+
+def _columns(rows: list[dict]) -> dict[str, list]:
+    """Transpose rows into {column: values} over the union of keys, in first-seen order."""
+    keys = dict.fromkeys(k for row in rows for k in row)
+    return {k: [row.get(k) for row in rows] for k in keys}
+
+
+def _frame(rows: list[dict], columns: Optional[dict[str, list]] = None):
+    """DataFrame over the union of row keys, in first-seen order (rows may differ in keys)."""
+    return pd.DataFrame(columns if columns is not None else _columns(rows))
+
+
+def write_csv(rows: list[dict], out_path: Path, columns: Optional[dict[str, list]] = None):
+    """Write rows with sorted headers; pass ``columns`` (from _columns) to reuse a transposition."""
     if not rows:
         print(f"[info] no rows to write -> {out_path}")
         return
-    keys = sorted({k for row in rows for k in row.keys()})
+    if columns is None:
+        columns = _columns(rows)
+    keys = sorted(columns)
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    import csv
     with out_path.open("w", newline="", encoding="utf-8") as fh:
-        writer = csv.DictWriter(fh, fieldnames=keys)
-        writer.writeheader()
-        for row in rows:
-            writer.writerow({k: row.get(k) for k in keys})
+        writer = csv.writer(fh)
+        writer.writerow(keys)
+        writer.writerows(zip(*(columns[k] for k in keys)))
     print(f"[ok] wrote {out_path}")
 
 
+def _token_sums(token_rows: List[dict]) -> list[tuple[tuple, int]]:
+    """n_tokens summed per (state, role), sorted by key; rows missing either key are
+    dropped, as a pandas groupby would."""
+    sums: Counter = Counter()
+    for row in token_rows:
+        key = (row.get("state"), row.get("role"))
+        if None in key:
+            continue
+        sums[key] += int(row.get("n_tokens") or 0)
+    return sorted(sums.items(), key=lambda kv: tuple(map(str, kv[0])))
+
+
 def _token_usage_by_run(token_rows: List[dict]) -> Dict[str, Dict[str, float]]:
     usage: Dict[str, Dict[str, float]] = {}
     for row in token_rows or []:
@@ -219,6 +348,9 @@ def _token_usage_by_run(token_rows: List[dict]) -> Dict[str, Dict[str, float]]:
 def _percentile(values: List[float], pct: float) -> Optional[float]:
     if not values:
         return None
+    if np is not None:
+        # Same linear interpolation as below, via introselect instead of a full sort.
+        return float(np.percentile(values, pct * 100))
     ordered = sorted(values)
     if len(ordered) == 1:
         return float(ordered[0])
@@ -236,14 +368,58 @@ def _safe_div(num: float, denom: float) -> Optional[float]:
     return (num / denom) if denom else None
 
 
-def _aggregate_metrics(run_rows: List[dict], stage_rows: List[dict], rank_rows: List[dict], token_usage: Dict[str, Dict[str, float]]):
+_COUNT_COLS = ("trust_tp", "trust_fp", "trust_fn", "intent_tp", "intent_fp", "intent_fn")
+
+
+def _run_totals(run_rows: List[dict], run_df=None) -> Tuple[Dict[str, float], List[float]]:
+    """Summed _COUNT_COLS and the numeric dt_wall_s values, from a single sweep over run_rows."""
+    if run_df is not None:
+        totals = run_df.reindex(columns=list(_COUNT_COLS)).apply(pd.to_numeric, errors="coerce").sum()
+        wall = [float(w) for w in (row.get("dt_wall_s") for row in run_rows) if isinstance(w, (int, float))]
+        return {col: float(totals[col]) for col in _COUNT_COLS}, wall
+    tp_t = fp_t = fn_t = tp_i = fp_i = fn_i = 0
+    wall = []
+    for row in run_rows:
+        get = row.get
+        tp_t += get("trust_tp") or 0
+        fp_t += get("trust_fp") or 0
+        fn_t += get("trust_fn") or 0
+        tp_i += get("intent_tp") or 0
+        fp_i += get("intent_fp") or 0
+        fn_i += get("intent_fn") or 0
+        w = get("dt_wall_s")
+        if isinstance(w, (int, float)):
+            wall.append(float(w))
+    return dict(zip(_COUNT_COLS, (tp_t, fp_t, fn_t, tp_i, fp_i, fn_i))), wall
+
+
+def _stage_latency(stage_rows: List[dict], stage_df=None) -> List[Tuple[str, Optional[float], float]]:
+    """(stage, p95, mean) per stage in first-seen order."""
+    if stage_df is not None:
+        grouped = stage_df.groupby("stage", sort=False)["dt_s"]
+        p95s, means = grouped.quantile(0.95), grouped.mean()
+        return [(stage, float(p95s[stage]), float(means[stage])) for stage in means.index]
+    stage_map: Dict[str, List[float]] = defaultdict(list)
+    for row in stage_rows or []:
+        stage_map[row["stage"]].append(float(row["dt_s"]))
+    return [(stage, _percentile(vals, 0.95), statistics.mean(vals)) for stage, vals in stage_map.items()]
+
+
+def _aggregate_metrics(
+    run_rows: List[dict],
+    stage_rows: List[dict],
+    rank_rows: List[dict],
+    token_usage: Dict[str, Dict[str, float]],
+    run_df=None,
+    stage_df=None,
+):
+    """Aggregate report metrics; pass the pandas frames when available to vectorize sums and quantiles."""
     if not run_rows:
         return {}
     agg: Dict[str, Optional[float]] = {"runs": len(run_rows)}
+    counts, wall = _run_totals(run_rows, run_df)
 
-    trust_tp = sum(row.get("trust_tp") or 0 for row in run_rows)
-    trust_fp = sum(row.get("trust_fp") or 0 for row in run_rows)
-    trust_fn = sum(row.get("trust_fn") or 0 for row in run_rows)
+    trust_tp, trust_fp, trust_fn = counts["trust_tp"], counts["trust_fp"], counts["trust_fn"]
     agg["trust_precision"] = _safe_div(trust_tp, trust_tp + trust_fp)
     agg["trust_recall"] = _safe_div(trust_tp, trust_tp + trust_fn)
     if agg["trust_precision"] is not None and agg["trust_recall"] is not None:
@@ -251,9 +427,7 @@ def _aggregate_metrics(run_rows: List[dict], stage_rows: List[dict], rank_rows:
         tr = agg["trust_recall"]
         agg["trust_f1"] = (2 * tp * tr / (tp + tr)) if (tp + tr) else None
 
-    intent_tp = sum(row.get("intent_tp") or 0 for row in run_rows)
-    intent_fp = sum(row.get("intent_fp") or 0 for row in run_rows)
-    intent_fn = sum(row.get("intent_fn") or 0 for row in run_rows)
+    intent_tp, intent_fp, intent_fn = counts["intent_tp"], counts["intent_fp"], counts["intent_fn"]
     agg["intent_precision"] = _safe_div(intent_tp, intent_tp + intent_fp)
     agg["intent_recall"] = _safe_div(intent_tp, intent_tp + intent_fn)
     if agg["intent_precision"] is not None and agg["intent_recall"] is not None:
@@ -262,14 +436,9 @@ def _aggregate_metrics(run_rows: List[dict], stage_rows: List[dict], rank_rows:
         agg["intent_f1"] = (2 * ip * ir / (ip + ir)) if (ip + ir) else None
 
     # Latency stats
-    stage_map: Dict[str, List[float]] = defaultdict(list)
-    for row in stage_rows or []:
-        stage_map[row["stage"]].append(float(row["dt_s"]))
-    for stage, vals in stage_map.items():
-        p95 = _percentile(vals, 0.95)
+    for stage, p95, mean in _stage_latency(stage_rows, stage_df):
         agg[f"latency_{stage}_p95_s"] = round(p95, 4) if p95 is not None else None
-        agg[f"latency_{stage}_mean_s"] = round(statistics.mean(vals), 4)
-    wall = [float(row.get("dt_wall_s")) for row in run_rows if isinstance(row.get("dt_wall_s"), (int, float))]
+        agg[f"latency_{stage}_mean_s"] = round(mean, 4)
     if wall:
         p95_wall = _percentile(wall, 0.95)
         agg["latency_wall_p95_s"] = round(p95_wall, 4) if p95_wall is not None else None
@@ -298,10 +467,44 @@ def _aggregate_metrics(run_rows: List[dict], stage_rows: List[dict], rank_rows:
     return agg
 
 
+@lru_cache(maxsize=None)
+def _source_digest() -> str:
+    """Digest of this script, so any change to the summary code invalidates old cache entries."""
+    return hashlib.blake2b(Path(__file__).read_bytes(), digest_size=16).hexdigest()
+
+
+def _cached(path: Path, kind: str, compute, cache_dir: Optional[Path] = None):
+    """Return ``compute(load_events(path))``, pickled in ``cache_dir`` (when given)
+    keyed by (script source, path, mtime, size)."""
+    try:
+        st = path.stat()
+    except OSError:
+        cache_dir = None
+    if cache_dir is None:
+        return compute(load_events(path))
+    raw = f"{_source_digest()}\0{kind}\0{path.resolve()}\0{st.st_mtime_ns}\0{st.st_size}"
+    cache_file = cache_dir / f"{hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()}.pkl"
+    try:
+        with cache_file.open("rb") as fh:
+            return pickle.load(fh)
+    except Exception:  # missing or unreadable entry -> recompute
+        pass
+    out = compute(load_events(path))
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = cache_file.with_suffix(f".{os.getpid()}.tmp")
+        with tmp.open("wb") as fh:
+            pickle.dump(out, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, cache_file)
+    except OSError:
+        pass
+    return out
+
+
 def main():
     args = parse_args()
-    events = load_events(Path(args.log))
-    run_rows, stage_rows, token_rows = summarize(events)
+    cache_dir = Path(args.cache_dir) if args.cache_dir else None
+    run_rows, stage_rows, token_rows, rank_rows = _cached(Path(args.log), "summary", summarize, cache_dir)
     token_usage = _token_usage_by_run(token_rows)
     for row in run_rows:
         usage = token_usage.get(row.get("run_id"), {})
@@ -310,31 +513,33 @@ def main():
         row["tokens_system"] = usage.get("system", 0)
         row["tokens_total"] = usage.get("total", 0)
         row["usd_cost"] = round(usage.get("usd_cost", 0.0), 6)
-    write_csv(run_rows, Path(args.out))
-    write_csv(stage_rows, Path(args.stages))
+    # Transpose each table once; the CSV writer and the DataFrames share the columns.
+    run_cols, stage_cols = _columns(run_rows), _columns(stage_rows)
+    write_csv(run_rows, Path(args.out), run_cols)
+    write_csv(stage_rows, Path(args.stages), stage_cols)
     write_csv(token_rows, Path(args.tokens))
 
-    if pd is not None and run_rows:
-        df = pd.DataFrame(run_rows)
+    df = _frame(run_rows, run_cols) if pd is not None and run_rows else None
+    sdf = _frame(stage_rows, stage_cols) if pd is not None and stage_rows else None
+    if df is not None and not args.quiet:
         print("\nRun-level metrics (means):")
         num_cols = [c for c in df.columns if c.startswith("dt_") or c.endswith("_hit")]
         if num_cols:
             print(df[num_cols].mean(numeric_only=True))
-        if stage_rows:
-            sdf = pd.DataFrame(stage_rows)
+        if sdf is not None:
             print("\nStage latency p95:")
             print(sdf.groupby("stage")["dt_s"].quantile(0.95))
         if token_rows:
-            tdf = pd.DataFrame(token_rows)
             print("\nToken usage by state:")
-            print(tdf.groupby(["state", "role"]).agg({"n_tokens": "sum"}))
+            # One Counter pass is cheaper than a DataFrame + groupby at any log size.
+            for (state, role), n in _token_sums(token_rows):
+                print(f"  {state} {role}: {n}")
 
     # Ranking metrics (NDCG@3, MRR)
-    rank_rows = _compute_rank_metrics(events)
     if rank_rows:
         write_csv(rank_rows, Path(str(Path(args.out).with_name("ranking_metrics.csv"))))
-        if pd is not None:
-            rdf = pd.DataFrame(rank_rows)
+        if pd is not None and not args.quiet:
+            rdf = _frame(rank_rows)
             print("\nRanking metrics (means):")
             print(rdf[["ndcg3", "mrr"]].mean(numeric_only=True))
             if args.bootstrap and args.bootstrap > 0:
@@ -346,13 +551,14 @@ def main():
 
     # Optional compare mode: summarize differences between two logs
     if args.compare and len(args.compare) == 2:
-        a_events = load_events(Path(args.compare[0]))
-        b_events = load_events(Path(args.compare[1]))
-        a_rank = _compute_rank_metrics(a_events)
-        b_rank = _compute_rank_metrics(b_events)
+        # The two logs are independent; overlap their reads.
+        with ThreadPoolExecutor(max_workers=2) as ex:
+            a_rank, b_rank = ex.map(
+                lambda p: _cached(Path(p), "rank", _compute_rank_metrics, cache_dir), args.compare
+            )
         if pd is not None and a_rank and b_rank:
-            adf = pd.DataFrame(a_rank)
-            bdf = pd.DataFrame(b_rank)
+            adf = _frame(a_rank)
+            bdf = _frame(b_rank)
             # Merge on image if present, fallback to index
             key = "image" if "image" in adf.columns and "image" in bdf.columns else "run_id"
             m = adf[[key, "ndcg3", "mrr"]].merge(bdf[[key, "ndcg3", "mrr"]], on=key, suffixes=("_A","_B"))
@@ -361,7 +567,7 @@ def main():
             cmp_path = Path(str(Path(args.out).with_name("ranking_compare.csv")))
             write_csv(m.to_dict(orient="records"), cmp_path)
 
-    aggregate = _aggregate_metrics(run_rows, stage_rows, rank_rows, token_usage)
+    aggregate = _aggregate_metrics(run_rows, stage_rows, rank_rows, token_usage, run_df=df, stage_df=sdf)
     if aggregate:
         agg_path = Path(str(Path(args.out).with_name("aggregate_metrics.csv")))
         write_csv([aggregate], agg_path)
@@ -13,20 +13,40 @@ emits one JSON object per product compatible with `Offer` creation.
 from __future__ import annotations
 
 import argparse
+import functools
 import gzip
 import hashlib
+import io
 import json
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Dict, Iterable, Iterator, List, Optional
 
+try:
+    import orjson  # optional; faster JSON parsing and serialization
+    _loads = orjson.loads
+    _dump_line = functools.partial(orjson.dumps, option=orjson.OPT_APPEND_NEWLINE)
+except Exception:  # pragma: no cover - optional dependency
+    _loads = json.loads
+
+    def _dump_line(obj: Dict) -> bytes:
+        return (json.dumps(obj, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+# Read-ahead over the decompressed stream; GzipFile's default is 8 KiB on 3.11.
+_READ_BUFFER = 128 * 1024
+_WRITE_BUFFER = 1 << 20
+
+
+_EMPTY: Dict = {}  # shared read-only default for nested .get() chains
+
 
 def _first_text(entries: Optional[Iterable[dict]]) -> Optional[str]:
     if not entries:
         return None
     for entry in entries:
-        value = entry.get("value") if isinstance(entry, dict) else None
-        if value:
-            return str(value)
+        if type(entry) is dict and (value := entry.get("value")):
+            return value if type(value) is str else str(value)
     return None
 
 
@@ -35,22 +55,25 @@ def _collect_text_list(entries: Optional[Iterable[dict]]) -> List[str]:
     if not entries:
         return values
     for entry in entries:
-        value = entry.get("value") if isinstance(entry, dict) else None
-        if value:
-            values.append(str(value))
+        if type(entry) is dict and (value := entry.get("value")):
+            values.append(value if type(value) is str else str(value))
     return values
 
 
+@functools.lru_cache(maxsize=4096)
+def _type_base_price(product_type: str) -> float:
+    # Roughly scale price buckets by product type prefix
+    bucket = sum(ord(ch) for ch in product_type[:4]) % 50
+    return 25.0 + bucket
+
+
 def _estimate_price(item_id: str, product_type: Optional[str]) -> float:
     """Deterministic synthetic price derived from item id and product type."""
-    base = 25.0
-    if product_type:
-        # Roughly scale price buckets by product type prefix
-        pt = str(product_type)
-        bucket = sum(ord(ch) for ch in pt[:4]) % 50
-        base += bucket
-    digest = hashlib.sha1(item_id.encode("utf-8")).hexdigest()
-    offset = int(digest[:8], 16) % 5000  # 0..4999
+    # ABO has a few hundred product types, so the bucket comes from a per-type cache.
+    base = _type_base_price(str(product_type)) if product_type else 25.0
+    # Leading 32 bits of the SHA-1, read straight from the digest (no hex round trip).
+    digest = hashlib.sha1(item_id.encode("utf-8")).digest()
+    offset = int.from_bytes(digest[:4], "big") % 5000  # 0..4999
     price = base + offset / 100.0  # up to ~=75 more
     return round(min(max(price, 9.99), 9999.0), 2)
 
@@ -60,6 +83,76 @@ def _iter_listing_files(metadata_dir: Path) -> Iterator[Path]:
         yield path
 
 
+def _record_to_offer(record: dict, image_base: str) -> Optional[Dict]:
+    """Offer dict for one listing record; ``image_base`` is the image URL prefix ending in '/'."""
+    # Records come straight from JSON, so exact type() checks stand in for isinstance().
+    get = record.get
+    item_id = get("item_id")
+    if not item_id:
+        return None
+    domain = get("domain_name") or "amazon.com"
+    title = _first_text(get("item_name")) or item_id
+    brand = _first_text(get("brand")) or domain
+    category = None
+    product_type = get("product_type")
+    if type(product_type) is list:
+        if product_type:
+            entry = product_type[0]
+            category = entry.get("value") if type(entry) is dict else str(entry)
+    elif type(product_type) is str:
+        category = product_type
+    description = "\n".join(_collect_text_list(get("bullet_point")))
+    keywords = _collect_text_list(get("item_keywords"))
+    image_id = get("main_image_id")
+    image_url = f"{image_base}{image_id}.jpg" if image_id else ""
+    url = f"https://{domain}/dp/{item_id}"
+    dims = get("item_dimensions") or _EMPTY
+    height = dims.get("height", _EMPTY).get("value")
+    width = dims.get("width", _EMPTY).get("value")
+    length = dims.get("length", _EMPTY).get("value")
+    weight_entries = get("item_weight")
+    weight = None
+    if weight_entries:
+        first_weight = weight_entries[0]
+        weight = first_weight.get("value") or first_weight.get("normalized_value", _EMPTY).get("value")
+    price = _estimate_price(item_id, category)
+    return {
+        "vendor": brand,
+        "title": title,
+        "price_usd": price,
+        "shipping_days": 3,
+        "eta_days": 5,
+        "url": url,
+        "category": category,
+        "keywords": keywords,
+        "description": description,
+        "image_url": image_url,
+        "attributes": {
+            "domain_name": domain,
+            "country": get("country"),
+            "height": height,
+            "width": width,
+            "length": length,
+            "weight": weight,
+        },
+    }
+
+
+def _process_shard(gz_path: Path, image_prefix: str, limit: Optional[int] = None) -> tuple[bytes, int]:
+    """Offer JSONL for one listings shard as (utf-8 bytes, record count), stopping at ``limit``."""
+    image_base = image_prefix.rstrip("/") + "/"
+    lines: List[bytes] = []
+    with gzip.open(gz_path, "rb") as gz, io.BufferedReader(gz, buffer_size=_READ_BUFFER) as fh:
+        for line in fh:
+            offer = _record_to_offer(_loads(line), image_base)
+            if offer is None:
+                continue
+            lines.append(_dump_line(offer))
+            if limit and len(lines) >= limit:
+                break
+    return b"".join(lines), len(lines)
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Prepare ABO offers JSONL")
     parser.add_argument(
@@ -86,6 +179,12 @@ def main() -> None:
         default=None,
         help="Optional max number of records to export (for quick tests)",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Processes decoding shards in parallel (default: CPU count; 1 disables)",
+    )
     args = parser.parse_args()
 
     metadata_dir = Path(args.metadata_dir)
@@ -95,73 +194,26 @@ def main() -> None:
     out_path = Path(args.out)
     out_path.parent.mkdir(parents=True, exist_ok=True)
 
+    paths = list(_iter_listing_files(metadata_dir))
+    process = functools.partial(_process_shard, image_prefix=args.image_prefix, limit=args.limit)
+    workers = min(max(1, args.workers), len(paths) or 1)
+    executor = ProcessPoolExecutor(workers) if workers > 1 else None
     count = 0
-    with out_path.open("w", encoding="utf-8") as out_file:
-        for gz_path in _iter_listing_files(metadata_dir):
-            with gzip.open(gz_path, "rt", encoding="utf-8") as fh:
-                for line in fh:
-                    record = json.loads(line)
-                    item_id = record.get("item_id")
-                    domain = record.get("domain_name") or "amazon.com"
-                    if not item_id:
-                        continue
-                    title = _first_text(record.get("item_name")) or item_id
-                    brand = _first_text(record.get("brand")) or domain
-                    category = None
-                    product_type = record.get("product_type")
-                    if isinstance(product_type, list) and product_type:
-                        entry = product_type[0]
-                        if isinstance(entry, dict):
-                            category = entry.get("value")
-                        else:
-                            category = str(entry)
-                    elif isinstance(product_type, str):
-                        category = product_type
-                    description = "\n".join(_collect_text_list(record.get("bullet_point")))
-                    keywords = _collect_text_list(record.get("item_keywords"))
-                    image_id = record.get("main_image_id")
-                    if image_id:
-                        prefix = args.image_prefix.rstrip("/")
-                        image_url = f"{prefix}/{image_id}.jpg"
-                    else:
-                        image_url = ""
-                    url = f"https://{domain}/dp/{item_id}"
-                    dims = record.get("item_dimensions") or {}
-                    height = dims.get("height", {}).get("value")
-                    width = dims.get("width", {}).get("value")
-                    length = dims.get("length", {}).get("value")
-                    weight_entries = record.get("item_weight") or []
-                    weight = None
-                    if weight_entries:
-                        first_weight = weight_entries[0]
-                        weight = first_weight.get("value") or first_weight.get("normalized_value", {}).get("value")
-                    price = _estimate_price(item_id, category)
-                    offer = {
-                        "vendor": brand,
-                        "title": title,
-                        "price_usd": price,
-                        "shipping_days": 3,
-                        "eta_days": 5,
-                        "url": url,
-                        "category": category,
-                        "keywords": keywords,
-                        "description": description,
-                        "image_url": image_url,
-                        "attributes": {
-                            "domain_name": domain,
-                            "country": record.get("country"),
-                            "height": height,
-                            "width": width,
-                            "length": length,
-                            "weight": weight,
-                        },
-                    }
-                    out_file.write(json.dumps(offer, ensure_ascii=False) + "\n")
-                    count += 1
-                    if args.limit and count >= args.limit:
-                        break
-            if args.limit and count >= args.limit:
-                break
+    try:
+        # Shards decode independently; results are written back in shard order.
+        results = executor.map(process, paths, chunksize=1) if executor is not None else map(process, paths)
+        with out_path.open("wb", buffering=_WRITE_BUFFER) as out_file:
+            for blob, n in results:
+                if args.limit and count + n > args.limit:
+                    n = args.limit - count
+                    blob = b"".join(blob.splitlines(keepends=True)[:n])
+                out_file.write(blob)
+                count += n
+                if args.limit and count >= args.limit:
+                    break
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
 
     print(f"Wrote {count:,} offers to {out_path}")
 
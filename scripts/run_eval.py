@@ -3,7 +3,7 @@
 Batch evaluation harness for the Agentic Purchase system.
 
 Features:
-- Iterates over a YAML dataset of test images and expected attributes.
+- Iterates over a YAML (or JSON/JSONL) dataset of test images and expected attributes.
 - Calls either legacy FastAPI endpoints (/saga/preview, /saga/start)
   or LangServe endpoints (/saga/preview/invoke, /saga/start/invoke).
 - Logs per-run JSON lines to Agentic_AI/logs/eval.log with:
@@ -36,45 +36,85 @@ from __future__ import annotations
 
 import argparse
 import base64
+import functools
 import io
 import json
 import mimetypes
 import os
 import sys
 import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, BinaryIO, Deque, Dict, List, Optional, Tuple
 
 import requests
 import yaml
+from requests.adapters import HTTPAdapter
 
+try:
+    import orjson  # optional; faster response parsing and log writes
+    _loads = orjson.loads
+    _dump_line = functools.partial(orjson.dumps, option=orjson.OPT_APPEND_NEWLINE)
+except Exception:  # pragma: no cover - optional dependency
+    _loads = json.loads
+
+    def _dump_line(obj: dict) -> bytes:
+        return (json.dumps(obj, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
 
 LOG_PATH = Path("backend/logs/eval.log")
+_LOG_BUFFER = 1 << 16
+
 
+# libyaml-backed loader when PyYAML was built with it; same safe semantics, several times faster.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
-def _read_yaml(path: Path) -> List[dict]:
-    with path.open("r", encoding="utf-8") as fh:
-        data = yaml.safe_load(fh) or []
+
+def _read_dataset(path: Path) -> List[dict]:
+    """Load the dataset list from .json, .jsonl (one item per line) or YAML."""
+    suffix = path.suffix.lower()
+    if suffix == ".json":
+        data = _loads(path.read_bytes()) or []
+    elif suffix == ".jsonl":
+        data = [_loads(line) for line in path.read_bytes().splitlines() if line.strip()]
+    else:
+        with path.open("rb") as fh:
+            data = yaml.load(fh, Loader=_YAML_LOADER) or []
     if not isinstance(data, list):
-        raise ValueError("dataset YAML must be a list")
+        raise ValueError("dataset must be a list")
     return data
 
 
-def _to_base64(image_path: Path) -> str:
-    data = image_path.read_bytes()
+def _to_base64(data: bytes) -> str:
     return base64.b64encode(data).decode("utf-8")
 
 
-def _mime_type(path: Path) -> str:
-    mt, _ = mimetypes.guess_type(str(path))
+def _make_session(pool_size: int = 1) -> requests.Session:
+    """Keep-alive session with one pooled connection per concurrent request, reused across the run."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+@functools.lru_cache(maxsize=32)
+def _mime_for_ext(ext: str) -> str:
+    mt, _ = mimetypes.guess_type("image" + ext)
     return mt or "image/jpeg"
 
 
+def _mime_type(path: Path) -> str:
+    return _mime_for_ext(path.suffix)
+
+
 def _legacy_form_call(
+    session: requests.Session,
     base_url: str,
     endpoint: str,
     image_path: Path,
+    img_bytes: bytes,
     user_text: Optional[str],
     preferred_offer_url: Optional[str],
     payment: Optional[dict],
@@ -82,7 +122,7 @@ def _legacy_form_call(
 ) -> Tuple[dict, float]:
     url = base_url.rstrip("/") + endpoint
     files = {
-        "image": (image_path.name, image_path.read_bytes(), _mime_type(image_path)),
+        "image": (image_path.name, img_bytes, _mime_type(image_path)),
     }
     data: Dict[str, Any] = {}
     if user_text:
@@ -101,16 +141,18 @@ def _legacy_form_call(
             }
         )
     t0 = time.time()
-    resp = requests.post(url, files=files, data=data, headers=headers, timeout=120)
+    resp = session.post(url, files=files, data=data, headers=headers, timeout=120)
     dt = time.time() - t0
     resp.raise_for_status()
-    return resp.json(), dt
+    return _loads(resp.content), dt
 
 
 def _langserve_call(
+    session: requests.Session,
     base_url: str,
     endpoint: str,  # "/saga/preview/invoke" or "/saga/start/invoke"
     image_path: Path,
+    img_bytes: bytes,
     user_text: Optional[str],
     preferred_offer_url: Optional[str],
     payment: Optional[dict],
@@ -118,7 +160,7 @@ def _langserve_call(
 ) -> Tuple[dict, float]:
     url = base_url.rstrip("/") + endpoint
     payload: Dict[str, Any] = {
-        "image_base64": _to_base64(image_path),
+        "image_base64": _to_base64(img_bytes),
         "user_text": user_text,
         "preferred_offer_url": preferred_offer_url,
     }
@@ -126,25 +168,41 @@ def _langserve_call(
         payload["payment"] = payment
         payload["idempotency_key"] = idempotency_key
     t0 = time.time()
-    resp = requests.post(url, json={"input": payload}, timeout=120)
+    resp = session.post(url, json={"input": payload}, timeout=120)
     dt = time.time() - t0
     resp.raise_for_status()
-    data = resp.json()
+    data = _loads(resp.content)
     # LangServe wraps return under { "output": ... }
     return data.get("output", data), dt
 
 
-def _stage_latencies(events: List[dict]) -> Dict[str, float]:
-    out: Dict[str, float] = {}
+def _fill_latencies(events: List[dict], metrics: Dict[str, Any]) -> Optional[float]:
+    """Write ``lat_<stage>`` into metrics in one pass; return the saga total (None if nothing was timed).
+
+    A repeated stage keeps its last timing, and only that timing counts toward the total.
+    """
+    total = 0.0
+    timed = repeated = False
     for ev in events or []:
         stage = ev.get("stage") or ev.get("state")
         dt = ev.get("dt_s")
         if stage and isinstance(dt, (int, float)):
-            out[str(stage)] = float(dt)
-    return out
+            key = f"lat_{stage}"
+            repeated = repeated or key in metrics
+            metrics[key] = float(dt)
+            total += float(dt)
+            timed = True
+    if not timed:
+        return None
+    if repeated:
+        total = sum(v for k, v in metrics.items() if k.startswith("lat_"))
+    return total
 
 
 def _norm_value(val: Any) -> Optional[str]:
+    if type(val) is str:  # common case first
+        val = val.strip()
+        return val.lower() if val else None
     if val is None:
         return None
     if isinstance(val, (int, float)):
@@ -160,10 +218,11 @@ def _intent_slot_scores(intent: dict, expect_intent: dict) -> Tuple[Dict[str, in
     slots = ("item_name", "color", "quantity", "budget_usd")
     slot_hits: Dict[str, int] = {}
     counts = {"tp": 0, "fp": 0, "fn": 0}
-    expect_intent = expect_intent or {}
+    gold_get = (expect_intent or {}).get
+    pred_get = intent.get
     for slot in slots:
-        gold = _norm_value(expect_intent.get(slot))
-        pred = _norm_value(intent.get(slot))
+        gold = _norm_value(gold_get(slot))
+        pred = _norm_value(pred_get(slot))
         if gold is None and pred is None:
             continue
         if gold is not None and pred == gold:
@@ -196,53 +255,53 @@ def _trust_flags(trust: Optional[dict], expect: dict) -> Dict[str, int]:
     }
 
 
-def _topk_hits(offers: List[dict], expect_brand: Optional[str], k: int = 3) -> Tuple[bool, bool]:
-    if not offers:
+def _expect_norm(expect: dict) -> Dict[str, str]:
+    """Stripped, lower-cased string expectations, computed once per dataset row."""
+    return {k: v.strip().lower() for k, v in expect.items() if isinstance(v, str)}
+
+
+def _topk_hits(offers: List[dict], expect_brand_norm: str, k: int = 3) -> Tuple[bool, bool]:
+    """``expect_brand_norm`` is already stripped and lower-cased (see _expect_norm)."""
+    if not offers or not expect_brand_norm:
         return False, False
-    expect_brand_norm = (expect_brand or "").strip().lower()
-    top1_hit = False
-    topk_hit = False
+    # The first match decides both flags: top-1 only if it is the first offer.
     for idx, off in enumerate(offers[: max(1, k) ]):
         brand = (off.get("vendor") or off.get("brand") or "").strip().lower()
-        if expect_brand_norm and brand and expect_brand_norm == brand:
-            if idx == 0:
-                top1_hit = True
-            topk_hit = True
-    return top1_hit, topk_hit
+        if brand == expect_brand_norm:
+            return idx == 0, True
+    return False, False
 
 
-def _recognition_hit(hypothesis: dict, intent: dict, expect: dict) -> bool:
-    # Hit if brand or family/category aligns with expectation
-    try:
-        hypo_label = (hypothesis.get("label") or "").lower().strip()
-        hypo_brand = (hypothesis.get("brand") or "").lower().strip()
-        intent_item = (intent.get("item_name") or "").lower().strip()
-        intent_brand = (intent.get("brand") or "").lower().strip()
-        expect_brand = (expect.get("brand") or "").lower().strip()
-        expect_family = (expect.get("family") or "").lower().strip()
-        expect_cat = (expect.get("category") or "").lower().strip()
-
-        conds = []
-        if expect_brand and (hypo_brand == expect_brand or intent_brand == expect_brand):
-            conds.append(True)
-        if expect_family and (expect_family in hypo_label or expect_family in intent_item):
-            conds.append(True)
-        if expect_cat and (expect_cat in hypo_label or expect_cat in intent_item):
-            conds.append(True)
-        return any(conds)
-    except Exception:
+def _lower(val: Any) -> str:
+    return val.strip().lower() if isinstance(val, str) else ""
+
+
+def _recognition_hit(hypothesis: dict, intent: dict, expect_norm: Dict[str, str]) -> bool:
+    # Hit if brand or family/category aligns with expectation (expect_norm from _expect_norm)
+    expect_brand = expect_norm.get("brand", "")
+    if expect_brand and expect_brand in (_lower(hypothesis.get("brand")), _lower(intent.get("brand"))):
+        return True
+    needles = [n for n in (expect_norm.get("family", ""), expect_norm.get("category", "")) if n]
+    if not needles:
         return False
+    hypo_label = _lower(hypothesis.get("label"))
+    intent_item = _lower(intent.get("item_name"))
+    return any(n in hypo_label or n in intent_item for n in needles)
 
 
-def _append_log(line: dict) -> None:
+def _open_log() -> BinaryIO:
+    """Append handle on LOG_PATH, kept open for the whole run; rows are flushed as they finish."""
     LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with LOG_PATH.open("a", encoding="utf-8") as fh:
-        fh.write(json.dumps(line, ensure_ascii=False) + "\n")
+    return LOG_PATH.open("ab", buffering=_LOG_BUFFER)
+
+
+def _append_log(log_fh: BinaryIO, line: dict) -> None:
+    log_fh.write(_dump_line(line))
 
 
 def parse_args() -> argparse.Namespace:
     ap = argparse.ArgumentParser(description="Run batch evaluation against saga endpoints")
-    ap.add_argument("--dataset", required=True, help="YAML list of test items")
+    ap.add_argument("--dataset", required=True, help="YAML, JSON or JSONL list of test items")
     ap.add_argument("--base", default="http://127.0.0.1:8000", help="Server base URL")
     ap.add_argument(
         "--mode",
@@ -260,13 +319,101 @@ def parse_args() -> argparse.Namespace:
     ap.add_argument("--cvv", dest="cvv", default=None)
     ap.add_argument("--idempotency", dest="idempotency_key", default=None)
     ap.add_argument("--label", dest="label", default=None, help="Optional label for this run (e.g., deterministic/llm)")
+    ap.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Concurrent requests (default: 1; dt_wall_s then includes any server-side queueing)",
+    )
     return ap.parse_args()
 
 
+@dataclass
+class _Job:
+    idx: int
+    row: dict
+    image_path: Path
+    run_id: str
+    future: Future
+
+
+def _call_row(call, session: requests.Session, base_url: str, endpoint: str, image_path: Path, *rest) -> Tuple[dict, float]:
+    # Runs on a worker thread; the image is read there so queued rows do not hold their bytes.
+    return call(session, base_url, endpoint, image_path, image_path.read_bytes(), *rest)
+
+
+def _finish_run(args: argparse.Namespace, endpoint: str, n_items: int, job: _Job, log_fh: BinaryIO) -> None:
+    """Wait for one row's response, then score it and append its RUN_RESULT (or RUN_ERROR)."""
+    image_path, run_id = job.image_path, job.run_id
+    expect = job.row.get("expect", {}) or {}
+    try:
+        data, wall_dt = job.future.result()
+    except (requests.RequestException, ValueError) as e:  # ValueError: undecodable JSON body
+        _append_log(log_fh, {
+            "type": "RUN_ERROR",
+            "run_id": run_id,
+            "error": str(e),
+        })
+        log_fh.flush()
+        print(f"[error] request failed for {image_path}: {e}")
+        return
+
+    # Extract stage latencies and accuracy metrics
+    events = data.get("log") or data.get("events") or []
+    offers = data.get("offers") or []
+    hypo = data.get("hypothesis") or {}
+    intent = data.get("intent") or {}
+    trust = data.get("trust") or {}
+    expect_intent = expect.get("intent") or {}
+    expect_norm = _expect_norm(expect)
+    top1, top3 = _topk_hits(offers, expect_norm.get("brand", ""))
+    recog = _recognition_hit(hypo, intent, expect_norm)
+    slot_hits, intent_counts = _intent_slot_scores(intent, expect_intent)
+    trust_flags = _trust_flags(trust, expect)
+
+    metrics = {
+        "recognition_hit": bool(recog),
+        "top1_brand_hit": bool(top1),
+        "top3_brand_hit": bool(top3),
+        "dt_wall_s": round(float(wall_dt), 4),
+        "dt_saga_s": None,  # filled from the stage timings below
+        "intent_tp": intent_counts["tp"],
+        "intent_fp": intent_counts["fp"],
+        "intent_fn": intent_counts["fn"],
+        **trust_flags,
+    }
+    saga_dt = _fill_latencies(events, metrics)
+    if saga_dt is not None:
+        metrics["dt_saga_s"] = round(saga_dt, 4)
+    metrics.update(slot_hits)
+
+    _append_log(log_fh, {
+        "type": "RUN_RESULT",
+        "run_id": run_id,
+        "image": str(image_path),
+        "mode": args.mode,
+        "endpoint": endpoint,
+        "base": args.base,
+        "label": args.label,
+        "expect": expect,
+        "metrics": metrics,
+        "events": events,
+        "hypothesis": hypo,
+        "intent": intent,
+        "offers": offers,
+        "offer": data.get("offer"),
+        "trust": trust,
+        "receipt": data.get("receipt"),
+    })
+    log_fh.flush()
+
+    print(f"[ok] {job.idx}/{n_items} {image_path.name}  recog={recog} top1={top1} top3={top3} wall={metrics['dt_wall_s']}s")
+
+
 def main() -> int:
     args = parse_args()
     dataset_path = Path(args.dataset)
-    items = _read_yaml(dataset_path)
+    items = _read_dataset(dataset_path)
 
     if args.mode == "start":
         if not (args.card_number and args.expiry_mm_yy and args.cvv):
@@ -281,100 +428,53 @@ def main() -> int:
     else:
         payment = None
 
-    for idx, row in enumerate(items, start=1):
-        image_path = Path(row.get("image", ""))
-        if not image_path.exists():
-            print(f"[warn] missing image: {image_path}")
-            continue
-        user_text = row.get("user_text")
-        preferred = row.get("preferred_offer_url")
-        expect = row.get("expect", {}) or {}
-
-        if args.langserve:
-            endpoint = f"/saga/{args.mode}/invoke"
-            call = _langserve_call
-        else:
-            endpoint = f"/saga/{args.mode}"
-            call = _legacy_form_call
-
-        run_id = f"{int(time.time())}-{idx}"
-        _append_log({
-            "type": "RUN_START",
-            "run_id": run_id,
-            "image": str(image_path),
-            "mode": args.mode,
-            "endpoint": endpoint,
-            "base": args.base,
-            "label": args.label,
-        })
-
-        try:
-            data, wall_dt = call(
+    if args.langserve:
+        endpoint = f"/saga/{args.mode}/invoke"
+        call = _langserve_call
+    else:
+        endpoint = f"/saga/{args.mode}"
+        call = _legacy_form_call
+
+    # Up to `workers` requests are in flight; results are scored and logged in dataset order.
+    workers = max(1, args.workers)
+    session = _make_session(workers)
+    pending: Deque[_Job] = deque()
+    with _open_log() as log_fh, ThreadPoolExecutor(max_workers=workers) as executor:
+        for idx, row in enumerate(items, start=1):
+            image_path = Path(row.get("image", ""))
+            if not image_path.exists():
+                print(f"[warn] missing image: {image_path}")
+                continue
+
+            run_id = f"{int(time.time())}-{idx}"
+            _append_log(log_fh, {
+                "type": "RUN_START",
+                "run_id": run_id,
+                "image": str(image_path),
+                "mode": args.mode,
+                "endpoint": endpoint,
+                "base": args.base,
+                "label": args.label,
+            })
+            future = executor.submit(
+                _call_row,
+                call,
+                session,
                 args.base,
                 endpoint,
                 image_path,
-                user_text,
-                preferred,
+                row.get("user_text"),
+                row.get("preferred_offer_url"),
                 payment,
                 args.idempotency_key,
             )
-        except requests.RequestException as e:
-            _append_log({
-                "type": "RUN_ERROR",
-                "run_id": run_id,
-                "error": str(e),
-            })
-            print(f"[error] request failed for {image_path}: {e}")
-            continue
-
-        # Extract stage latencies and accuracy metrics
-        events = data.get("log") or data.get("events") or []
-        lats = _stage_latencies(events)
-        offers = data.get("offers") or []
-        hypo = data.get("hypothesis") or {}
-        intent = data.get("intent") or {}
-        trust = data.get("trust") or {}
-        expect_intent = expect.get("intent") or {}
-        top1, top3 = _topk_hits(offers, expect.get("brand"))
-        recog = _recognition_hit(hypo, intent, expect)
-        slot_hits, intent_counts = _intent_slot_scores(intent, expect_intent)
-        trust_flags = _trust_flags(trust, expect)
-
-        metrics = {
-            "recognition_hit": bool(recog),
-            "top1_brand_hit": bool(top1),
-            "top3_brand_hit": bool(top3),
-            "dt_wall_s": round(float(wall_dt), 4),
-            "dt_saga_s": round(sum(lats.values()), 4) if lats else None,
-            "intent_tp": intent_counts["tp"],
-            "intent_fp": intent_counts["fp"],
-            "intent_fn": intent_counts["fn"],
-            **trust_flags,
-        }
-        metrics.update({f"lat_{k}": v for k, v in lats.items()})
-        metrics.update(slot_hits)
-
-        _append_log({
-            "type": "RUN_RESULT",
-            "run_id": run_id,
-            "image": str(image_path),
-            "mode": args.mode,
-            "endpoint": endpoint,
-            "base": args.base,
-            "label": args.label,
-            "expect": expect,
-            "metrics": metrics,
-            "events": events,
-            "hypothesis": hypo,
-            "intent": intent,
-            "offers": offers,
-            "offer": data.get("offer"),
-            "trust": trust,
-            "receipt": data.get("receipt"),
-        })
-
-        print(f"[ok] {idx}/{len(items)} {image_path.name}  recog={recog} top1={top1} top3={top3} wall={metrics['dt_wall_s']}s")
+            pending.append(_Job(idx, row, image_path, run_id, future))
+            if len(pending) >= workers:
+                _finish_run(args, endpoint, len(items), pending.popleft(), log_fh)
+        while pending:
+            _finish_run(args, endpoint, len(items), pending.popleft(), log_fh)
 
+    session.close()
     print(f"\nWrote logs to: {LOG_PATH}")
     print("Use: python scripts/eval_report.py --log backend/logs/eval.log")
     return 0